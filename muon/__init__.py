@@ -1,2 +1,12 @@
 from .core import *
 from .elements import *
+from .streaming import *
+from .serialization import *
+from .analysis import *
+from .fragments import *
+from .cache import *
+from .warmup import *
+from .assets import *
+from .prototypes import *
+from . import asgi
+from . import wsgi
@@ -0,0 +1,26 @@
+import argparse
+import sys
+from muon.build import build
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m muon', description='Muon command line tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_build = commands.add_parser('build', help='render page modules into a static site')
+    parser_build.add_argument('source', help='directory of page modules')
+    parser_build.add_argument('-o', '--output', default='build', help='output directory (default: build)')
+    parser_build.add_argument('-r', '--root', default='.', help='directory page modules are imported from (default: .)')
+    parser_build.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes (default: all cpus)')
+    parser_build.add_argument('-f', '--force', action='store_true', help='rebuild every page')
+    arguments = parser.parse_args()
+
+    if arguments.command == 'build':
+        result = build(arguments.source, arguments.output, arguments.root, arguments.jobs, arguments.force)
+        print('built {}, skipped {}, removed {} modules'.format(len(result['built']), len(result['skipped']), len(result['removed'])))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
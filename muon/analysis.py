@@ -0,0 +1,118 @@
+from muon.core import Renderable
+from muon.elements import Element
+from muon.elements import renders_structure
+from muon.elements import SafeBuffer
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+__all__ = [
+    'Analysis',
+    'LimitExceeded',
+    'analyze',
+]
+
+
+class LimitExceeded(ValueError):
+    pass
+
+
+class Analysis:
+    """
+    The shape and estimated output size of an element tree.
+    """
+
+    def __init__(self, max_nodes: int | None = None, max_depth: int | None = None, max_bytes: int | None = None) -> None:
+        self.nodes = 0
+        self.depth = 0
+        self.size = 0
+        self.elements: dict[str, int] = {}
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+
+    def visit(self, children: Renderable, depth: int) -> None:
+        if children is None:
+            return
+        elif isinstance(children, str):
+            self.count(depth)
+            self.grow(len(children))
+        elif isinstance(children, Iterator):
+            # Single-use iterables cannot be inspected without consuming them,
+            # so limits cannot be enforced on trees which contain them
+            if self.has_limits():
+                raise LimitExceeded('trees containing single-use iterators cannot be checked against limits')
+            return
+        elif isinstance(children, Iterable):
+            for child in children:
+                self.visit(child, depth)
+        elif isinstance(children, SafeBuffer):
+            # Buffers are measured without being decoded
+            self.count(depth)
+            self.grow(children.view().nbytes)
+        elif isinstance(children, Element):
+            self.count(depth + 1)
+            name = type(children).__name__
+            self.elements[name] = self.elements.get(name, 0) + 1
+
+            if renders_structure(children):
+                if children.void:
+                    self.grow(len(str(children.tag)) + 3)
+                else:
+                    self.grow(len(str(children.tag)) * 2 + 5)
+                    self.visit(children.children, depth + 1)
+                for key, value in children.attributes.items():
+                    self.grow(len(key) + estimate(value) + 4)
+            else:
+                self.visit(children.render(), depth + 1)
+        else:
+            self.count(depth)
+            self.grow(len(str(children)))
+
+    def has_limits(self) -> bool:
+        return self.max_nodes is not None or self.max_depth is not None or self.max_bytes is not None
+
+    def count(self, depth: int) -> None:
+        self.nodes += 1
+        self.depth = max(self.depth, depth)
+
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise LimitExceeded('tree exceeds {} nodes'.format(self.max_nodes))
+        if self.max_depth is not None and self.depth > self.max_depth:
+            raise LimitExceeded('tree exceeds a depth of {}'.format(self.max_depth))
+
+    def grow(self, size: int) -> None:
+        self.size += size
+
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise LimitExceeded('output exceeds {} bytes'.format(self.max_bytes))
+
+
+def estimate(value: Any) -> int:
+    """
+    Estimates the rendered size of an attribute value.
+    """
+    if isinstance(value, bool) or value is None:
+        return 0
+    elif isinstance(value, str):
+        return len(value)
+    elif isinstance(value, dict):
+        return sum(len(str(k)) + estimate(v) + 2 for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return sum(estimate(v) + 1 for v in value)
+    return len(str(value))
+
+
+def analyze(node: Renderable, max_nodes: int | None = None, max_depth: int | None = None, max_bytes: int | None = None) -> Analysis:
+    """
+    Inspects an element tree without rendering it, returning the number of
+    nodes, the maximum depth, the number of elements of each type, and an
+    estimate of the output size. Components are evaluated in order to inspect
+    their output, but single-use iterators are skipped. A `LimitExceeded` error
+    is raised as soon as any of the given limits are exceeded, or if any limits
+    are given and the tree contains a single-use iterator (which would bypass
+    them).
+    """
+    analysis = Analysis(max_nodes, max_depth, max_bytes)
+    analysis.visit(node, 0)
+    return analysis
@@ -0,0 +1,76 @@
+from muon.core import Renderable
+from muon.elements import Chunk
+from muon.responses import accepts_gzip
+from muon.responses import BodyEncoder
+from muon.responses import CONTENT_TYPE
+from muon.responses import get_length
+from muon.responses import get_headers
+from muon.streaming import CHUNK_SIZE
+from muon.streaming import ENCODING
+from muon.streaming import iter_suspended
+from muon.streaming import Suspended
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Iterable
+
+__all__ = [
+    'response',
+]
+
+Application = Callable[[dict[str, Any], Callable[[], Awaitable[Any]], Callable[[Any], Awaitable[None]]], Awaitable[None]]
+
+
+def response(
+    node: Renderable,
+    status: int = 200,
+    headers: Iterable[tuple[str, str]] = (),
+    size: int = CHUNK_SIZE,
+    compress: bool = True,
+    content_type: str = CONTENT_TYPE,
+) -> Application:
+    """
+    Creates an ASGI application which streams a node (including `Suspense`
+    elements) in chunks of roughly `size` characters. Outputs which fit in a
+    single chunk are sent with a `Content-Length`, and gzip is used if
+    `compress` is set and the client accepts it.
+    """
+    async def application(scope: dict[str, Any], receive: Callable[[], Awaitable[Any]], send: Callable[[Any], Awaitable[None]]) -> None:
+        accept = [v for k, v in scope.get('headers', ()) if k.lower() == b'accept-encoding']
+        gzip = compress and accepts_gzip(b','.join(accept).decode('latin-1'))
+        encoder = BodyEncoder(ENCODING, gzip)
+        suspended = Suspended()
+        chunks = iter_suspended(node, size, suspended)
+
+        def start(length: int | None) -> dict[str, Any]:
+            return {
+                'type': 'http.response.start',
+                'status': status,
+                'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in get_headers(headers, content_type, compress, gzip, length)],
+            }
+
+        try:
+            head: list[Chunk] = []
+            length = 0
+
+            # Pending suspended elements would delay the response
+            while length < size and not suspended.tasks:
+                chunk = await anext(chunks, None)
+                if chunk is None:
+                    body = encoder.encode_all(head)
+                    await send(start(len(body)))
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+                head.append(chunk)
+                length += get_length(chunk)
+
+            await send(start(None))
+            for chunk in head:
+                await send({'type': 'http.response.body', 'body': encoder.encode(chunk), 'more_body': True})
+            async for chunk in chunks:
+                await send({'type': 'http.response.body', 'body': encoder.encode(chunk), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': encoder.finish()})
+        finally:
+            await chunks.aclose()
+
+    return application
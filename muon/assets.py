@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import re
+from abc import ABC
+from abc import abstractmethod
+from muon.cache import Cache
+from muon.core import Renderable
+from muon.elements import Chunk
+from muon.elements import EMPTY
+from muon.elements import HtmlElement
+from muon.elements import render_html_attributes
+from muon.elements import Safe
+from muon.elements import SPACE
+from typing import Any
+from typing import Hashable
+from typing import Iterator
+
+__all__ = [
+    'InlineScript',
+    'InlineStyle',
+    'JsonScript',
+]
+
+# Characters which are escaped in embedded JSON (and their escapes)
+JSON_ESCAPES = (
+    ('<', '\\u003c'),
+    ('>', '\\u003e'),
+    ('&', '\\u0026'),
+    ('\u2028', '\\u2028'),
+    ('\u2029', '\\u2029'),
+)
+
+# Encoder of embedded JSON
+ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+# Encoded data of cached JSON scripts (keyed by their cache keys and encoders)
+JSON = Cache(max_size=256)
+
+# Processed contents of inlined assets (keyed by file state and content hash)
+ASSETS = Cache(max_size=256)
+
+# Closing tags which are escaped in inlined assets
+STYLE_END = re.compile(r'</(?=style)', re.IGNORECASE)
+SCRIPT_END = re.compile(r'</(?=script)', re.IGNORECASE)
+
+# Strings, comments, and whitespace of style sheets
+CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(?:\s|/\*.*?\*/)+', re.DOTALL)
+
+# Characters of style sheets which do not need surrounding whitespace
+CSS_DELIMITERS = frozenset('{};,>')
+
+# Marks a template literal on the stack of a script scanner
+TEMPLATE = -1
+
+
+def escape_json(text: str) -> str:
+    """
+    Escapes encoded JSON so that it can be embedded in a script element.
+    """
+    # Repeated replacements are much faster than a single translation
+    for character, escape in JSON_ESCAPES:
+        text = text.replace(character, escape)
+    return text
+
+
+class JsonScript(HtmlElement):
+    """
+    A script element containing JSON data. The data is encoded and escaped for
+    embedding in HTML when the element is rendered. If a `cache_key` is given,
+    the encoded data is cached under that key, so the key must change whenever
+    the data changes (such as by including a revision of the data).
+    """
+
+    def __init__(self, data: Any, cache_key: Hashable | None = None, encoder: json.JSONEncoder = ENCODER, **kwargs: Any) -> None:
+        super().__init__(**{'type': 'application/json', **kwargs}, tag='script', void=False)
+        self.data = data
+        self.cache_key = cache_key
+        self.encoder = encoder
+
+    def encode(self) -> str:
+        if self.cache_key is None:
+            return escape_json(self.encoder.encode(self.data))
+        return JSON.get_or_set((self.cache_key, self.encoder), lambda: escape_json(self.encoder.encode(self.data)))
+
+    def render(self) -> Renderable:
+        return Safe('<script{}>{}</script>'.format(render_html_attributes(self.attributes), self.encode()))
+
+    def stream(self) -> Iterator[Chunk]:
+        yield '<script{}>'.format(render_html_attributes(self.attributes))
+        yield self.encode()
+        yield '</script>'
+
+
+def minify_css(text: str) -> str:
+    """
+    Removes comments and unnecessary whitespace from a style sheet. Strings
+    are preserved, and remaining whitespace is collapsed to a single space.
+    """
+    def replace(match: re.Match[str]) -> str:
+        if match.group(1):
+            return match.group(1)
+
+        start, end = match.span()
+        if start == 0 or end == len(text) or text[start - 1] in CSS_DELIMITERS or text[end] in CSS_DELIMITERS:
+            return EMPTY
+        return SPACE
+
+    return CSS_TOKENS.sub(replace, text)
+
+
+class ScriptScanner:
+    """
+    Tracks whether each line of a script begins or ends within a template
+    literal, a continued string, or a block comment.
+    """
+
+    def __init__(self) -> None:
+        # Enclosing template literals and substitutions (by their brace depth)
+        self.stack: list[int] = []
+        self.quote: str | None = None
+        self.comment = False
+
+    def is_literal(self) -> bool:
+        return self.quote is not None or (bool(self.stack) and self.stack[-1] == TEMPLATE)
+
+    def scan(self, line: str) -> None:
+        i = 0
+
+        while i < len(line):
+            character = line[i]
+
+            if self.comment:
+                if line.startswith('*/', i):
+                    self.comment = False
+                    i += 1
+            elif self.quote is not None or self.is_literal():
+                if character == '\\':
+                    i += 1
+                elif character == self.quote:
+                    self.quote = None
+                elif self.quote is None and character == '`':
+                    self.stack.pop()
+                elif self.quote is None and line.startswith('${', i):
+                    self.stack.append(0)
+                    i += 1
+            elif line.startswith('//', i):
+                break
+            elif line.startswith('/*', i):
+                self.comment = True
+                i += 1
+            elif character in '\'"':
+                self.quote = character
+            elif character == '`':
+                self.stack.append(TEMPLATE)
+            elif character == '{' and self.stack:
+                self.stack[-1] += 1
+            elif character == '}' and self.stack:
+                if self.stack[-1] == 0:
+                    self.stack.pop()
+                else:
+                    self.stack[-1] -= 1
+            i += 1
+
+        # Strings only continue onto the next line after a backslash
+        if self.quote is not None and not line.endswith('\\'):
+            self.quote = None
+
+
+def minify_js(text: str) -> str:
+    """
+    Conservatively minifies a script by removing leading and trailing
+    whitespace from each line and removing blank lines. Line breaks are kept so
+    that automatic semicolon insertion is not affected, and lines within
+    template literals and continued strings are left unchanged.
+    """
+    scanner = ScriptScanner()
+    lines = []
+
+    for line in text.split('\n'):
+        inside = scanner.is_literal()
+        scanner.scan(line)
+
+        if not inside:
+            line = line.lstrip()
+        if not scanner.is_literal():
+            line = line.rstrip()
+        if line or inside:
+            lines.append(line)
+
+    return '\n'.join(lines)
+
+
+class InlineAsset(HtmlElement, ABC):
+    """
+    An element containing the contents of a file. The contents are read and
+    processed once, then cached until the size, modification time, or content
+    hash of the file changes.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], minify: bool = False, encoding: str = 'utf-8', tag: str | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs, tag=tag, void=False)
+        self.path = path
+        self.minify = minify
+        self.encoding = encoding
+
+    @abstractmethod
+    def process(self, text: str) -> str:
+        pass
+
+    def load(self) -> str:
+        path = os.fspath(self.path)
+        status = os.stat(path)
+        key = type(self), path, status.st_mtime_ns, status.st_size, self.minify, self.encoding
+        content = ASSETS.get(key)
+
+        if content is None:
+            with open(path, 'rb') as file:
+                data = file.read()
+
+            # Files which are touched but unchanged are not processed again
+            digest = type(self), hashlib.blake2b(data).digest(), self.minify, self.encoding
+            content = ASSETS.get(digest)
+
+            if content is None:
+                content = self.process(data.decode(self.encoding))
+                ASSETS.set(digest, content)
+            ASSETS.set(key, content)
+
+        return content
+
+    def render(self) -> Renderable:
+        return Safe('<{0}{1}>{2}</{0}>'.format(self.tag, render_html_attributes(self.attributes), self.load()))
+
+    def stream(self) -> Iterator[Chunk]:
+        yield '<{}{}>'.format(self.tag, render_html_attributes(self.attributes))
+        yield self.load()
+        yield '</{}>'.format(self.tag)
+
+
+class InlineStyle(InlineAsset):
+    """
+    A style element containing a style sheet.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], **kwargs: Any) -> None:
+        super().__init__(path, **kwargs, tag='style')
+
+    def process(self, text: str) -> str:
+        if self.minify:
+            text = minify_css(text)
+        return STYLE_END.sub(r'<\\/', text)
+
+
+class InlineScript(InlineAsset):
+    """
+    A script element containing a script.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], **kwargs: Any) -> None:
+        super().__init__(path, **kwargs, tag='script')
+
+    def process(self, text: str) -> str:
+        if self.minify:
+            text = minify_js(text)
+        return SCRIPT_END.sub(r'<\\/', text)
@@ -0,0 +1,363 @@
+import argparse
+import gc
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+from muon.analysis import analyze
+from muon.core import Renderable
+from muon.elements import Anchor
+from muon.elements import Block
+from muon.elements import Body
+from muon.elements import DocType
+from muon.elements import Head
+from muon.elements import Heading
+from muon.elements import Html
+from muon.elements import Input
+from muon.elements import Link
+from muon.elements import Meta
+from muon.elements import Safe
+from muon.elements import Script
+from muon.elements import Table
+from muon.elements import TableCell
+from muon.elements import TableRow
+from muon.elements import Title
+from muon.prototypes import Prototype
+from typing import Callable
+
+# Number of rows in the table tree
+ROWS = 10_000
+
+# Number of levels in the nesting tree
+LEVELS = 100
+
+# Number of children in the flat tree
+CHILDREN = 10_000
+
+# Memory budgets per tree (in bytes and objects)
+BUDGETS = {
+    'page': {
+        'build_peak': 10_000,
+        'render_peak': 8_000,
+        'objects_per_node': 10.0,
+    },
+    'table': {
+        'build_peak': 18_000_000,
+        'render_peak': 4_000_000,
+        'objects_per_node': 1.5,
+    },
+    'nesting': {
+        'build_peak': 40_000,
+        'render_peak': 45_000,
+        'objects_per_node': 1.5,
+    },
+    'flat': {
+        'build_peak': 1_600_000,
+        'render_peak': 1_000_000,
+        'objects_per_node': 0.5,
+    },
+    'prototype': {
+        'build_peak': 3_000_000,
+        'render_peak': 4_000_000,
+        'objects_per_node': 1.5,
+    },
+}
+
+
+def page() -> Renderable:
+    """
+    Builds the example page.
+    """
+    return [
+        DocType(),
+        Html(
+            lang='en',
+            children=[
+                Head(
+                    children=[
+                        Meta(charset='utf-8'),
+                        Meta(http_equiv='x-ua-compatible', content='ie=edge'),
+                        Meta(name='viewport', content='width=device-width, initial-scale=1'),
+                        Link(href='/static/favicon.png', rel='icon', type='image/png'),
+                        Script(src='/static/index.js', type='application/javascript', defer=True),
+                        Title(children='Example'),
+                    ],
+                ),
+                Body(
+                    children=[
+                        Heading(classes='heading', children='This is a heading'),
+                        Input(
+                            classes=['input', 'large'],
+                            style={'font_family': 'Courier', 'font_size': '20px'},
+                            value='This is a value',
+                            maxlength=30,
+                            readonly=False,
+                            required=True,
+                        ),
+                        Safe('\'"><'),
+                        '\'"><',
+                    ],
+                ),
+            ],
+        ),
+    ]
+
+
+def table() -> Renderable:
+    """
+    Builds a table with many rows.
+    """
+    def row(i: int) -> Renderable:
+        return TableRow(
+            classes=['row', 'odd' if i % 2 else 'even'],
+            children=[
+                TableCell(children=str(i)),
+                TableCell(children='Item <{}>'.format(i)),
+                TableCell(children=Anchor(href='/items/{}'.format(i), children='View')),
+            ],
+        )
+
+    return Table(id='results', children=[row(i) for i in range(ROWS)])
+
+
+# Row of the prototype tree
+ROW = Prototype(
+    lambda index, parity, label, href: TableRow(
+        classes=['row', parity],
+        children=[
+            TableCell(children=index),
+            TableCell(children=label),
+            TableCell(children=Anchor(href=href, children='View')),
+        ],
+    ),
+)
+
+
+def prototype() -> Renderable:
+    """
+    Builds the table tree from a prototype row.
+    """
+    def row(i: int) -> Renderable:
+        return ROW(index=str(i), parity='odd' if i % 2 else 'even', label='Item <{}>'.format(i), href='/items/{}'.format(i))
+
+    return Table(id='results', children=[row(i) for i in range(ROWS)])
+
+
+def nesting() -> Renderable:
+    """
+    Builds a deeply nested tree.
+    """
+    node: Renderable = 'Leaf'
+    for i in range(LEVELS):
+        node = Block(classes='level', data_level=i, children=node)
+    return node
+
+
+def flat() -> Renderable:
+    """
+    Builds an element with many children of mixed types.
+    """
+    def child(i: int) -> Renderable:
+        match i % 5:
+            case 0:
+                return 'Text <{}>'.format(i)
+            case 1:
+                return Safe('<br/>')
+            case 2:
+                return None
+            case 3:
+                return ('a', 'b')
+            case _:
+                return Anchor(children=str(i))
+
+    return Block(children=[child(i) for i in range(CHILDREN)])
+
+
+# Standard trees
+TREES: dict[str, Callable[[], Renderable]] = {
+    'page': page,
+    'table': table,
+    'nesting': nesting,
+    'flat': flat,
+    'prototype': prototype,
+}
+
+
+def render(node: Renderable) -> str:
+    """
+    Renders a tree (including top-level lists).
+    """
+    if isinstance(node, list):
+        return ''.join(map(str, node))
+    return str(node)
+
+
+def measure_time(build: Callable[[], Renderable], repeat: int) -> dict[str, float]:
+    """
+    Measures the time taken to build and render a tree.
+    """
+    nodes = analyze(build()).nodes
+    build_time = min(timeit.repeat(build, number=1, repeat=repeat))
+    render_time = min(timeit.repeat(lambda: render(build()), number=1, repeat=repeat)) - build_time
+
+    return {
+        'nodes': nodes,
+        'build_ns_per_node': build_time * 1e9 / nodes,
+        'render_ns_per_node': render_time * 1e9 / nodes,
+    }
+
+
+def measure_memory(build: Callable[[], Renderable]) -> dict[str, float]:
+    """
+    Measures the peak memory used to build and render a tree, and the number
+    of objects which remain alive per node of the built tree.
+    """
+    # Warm up caches which are populated once per process
+    render(build())
+
+    gc.collect()
+    objects = len(gc.get_objects())
+
+    tracemalloc.start()
+    try:
+        node = build()
+        _, build_peak = tracemalloc.get_traced_memory()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        output = render(node)
+        _, render_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    gc.collect()
+    nodes = analyze(node).nodes
+    live = len(gc.get_objects()) - objects
+    del output
+
+    return {
+        'nodes': nodes,
+        'build_peak': build_peak,
+        'render_peak': render_peak - retained,
+        'retained': retained,
+        'objects_per_node': live / nodes,
+    }
+
+
+def measure_allocations(build: Callable[[], Renderable]) -> dict[str, float]:
+    """
+    Measures the peak memory used to build and render a tree together, the
+    number of objects tracked by the garbage collector once it is built, and
+    the number of collections triggered while building and rendering it.
+    """
+    # Warm up caches which are populated once per process
+    render(build())
+
+    gc.collect()
+    objects = len(gc.get_objects())
+    collections = gc.get_stats()[0]['collections']
+
+    tracemalloc.start()
+    try:
+        node = build()
+        live = len(gc.get_objects()) - objects
+        output = render(node)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del node, output
+
+    return {
+        'peak': peak,
+        'objects': live,
+        'collections': gc.get_stats()[0]['collections'] - collections,
+    }
+
+
+def measure_threads(build: Callable[[], Renderable], threads: int, duration: float) -> dict[str, float]:
+    """
+    Measures the throughput of building and rendering a tree in one thread
+    and in `threads` threads, and the resulting scaling efficiency (1.0 is
+    perfectly linear).
+    """
+    def run(count: int) -> float:
+        renders = [0] * count
+        barrier = threading.Barrier(count + 1)
+
+        def work(index: int) -> None:
+            barrier.wait()
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline:
+                render(build())
+                renders[index] += 1
+
+        workers = [threading.Thread(target=work, args=(i,)) for i in range(count)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        for worker in workers:
+            worker.join()
+        return sum(renders) / duration
+
+    single = run(1)
+    multiple = run(threads)
+
+    return {
+        'threads': threads,
+        'renders_per_second_1': single,
+        'renders_per_second_{}'.format(threads): multiple,
+        'scaling': multiple / (single * threads),
+    }
+
+
+def check(name: str, results: dict[str, float]) -> list[str]:
+    """
+    Compares memory results against the budgets of a tree.
+    """
+    return [
+        '{}: {} is {:,.1f} (budget {:,.1f})'.format(name, key, results[key], budget)
+        for key, budget in BUDGETS.get(name, {}).items()
+        if results[key] > budget
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m muon.benchmark', description='Benchmarks rendering of standard trees.')
+    parser.add_argument('trees', nargs='*', metavar='tree', help='trees to benchmark: {} (default: all)'.format(', '.join(TREES)))
+    parser.add_argument('--memory', action='store_true', help='measure memory with tracemalloc and check budgets')
+    parser.add_argument('--allocations', action='store_true', help='measure allocations of building and rendering each tree')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timing repetitions')
+    parser.add_argument('--threads', type=int, default=0, help='measure throughput scaling across this many threads')
+    parser.add_argument('--duration', type=float, default=2.0, help='seconds to render for in each thread measurement')
+    arguments = parser.parse_args()
+
+    failures = []
+
+    for name in arguments.trees:
+        if name not in TREES:
+            parser.error('unknown tree: {}'.format(name))
+
+    for name in arguments.trees or TREES:
+        if arguments.memory:
+            results = measure_memory(TREES[name])
+            failures += check(name, results)
+        elif arguments.allocations:
+            results = measure_allocations(TREES[name])
+        elif arguments.threads:
+            results = measure_threads(TREES[name], arguments.threads, arguments.duration)
+        else:
+            results = measure_time(TREES[name], arguments.repeat)
+        print(name, ' '.join('{}={:,.1f}'.format(k, v) for k, v in results.items()))
+
+    if arguments.threads and getattr(sys, '_is_gil_enabled', lambda: True)():
+        print('note: the GIL is enabled, so threads are not expected to scale', file=sys.stderr)
+
+    for failure in failures:
+        print('over budget:', failure, file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
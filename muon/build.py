@@ -0,0 +1,275 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import sysconfig
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from muon.elements import Element
+from muon.elements import FUNCTIONS
+from muon.streaming import spool
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from typing import Iterable
+
+__all__ = [
+    'build',
+]
+
+# Name of the build manifest (within the output directory)
+MANIFEST = '.muon-build.json'
+
+# Extension of rendered pages
+EXTENSION = '.html'
+
+# Directories of the standard library and installed packages (which are never
+# tracked, even within a virtual environment under the root)
+INSTALLED = tuple({Path(sysconfig.get_path(name)).resolve() for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')})
+
+# Content hashes of source files within a process (keyed by their states)
+HASHES: dict[tuple[str, int, int], str | None] = {}
+
+
+def get_version() -> str:
+    """
+    Returns the installed version of muon.
+    """
+    try:
+        return metadata.version('muon')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def hash_file(path: str | Path) -> str | None:
+    """
+    Returns the content hash of a file (or `None` if it does not exist).
+    """
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.file_digest(file, 'sha256').hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def hash_source(path: Path) -> str | None:
+    """
+    Returns the content hash of a source file, reusing its hash if the file is
+    unchanged since it was last hashed by this process.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    key = str(path), stat.st_mtime_ns, stat.st_size
+    if key not in HASHES:
+        HASHES[key] = hash_file(path)
+    return HASHES[key]
+
+
+def discover(source: Path, root: Path) -> list[str]:
+    """
+    Finds the names of the page modules in a source directory.
+    """
+    names = []
+    for path in sorted(source.rglob('*.py')):
+        if not path.name.startswith('_'):
+            names.append('.'.join(path.relative_to(root).with_suffix('').parts))
+    return names
+
+
+def get_pages(module: ModuleType) -> dict[str, Any]:
+    """
+    Returns the root elements and functional elements exported by a module.
+    Functional elements are only pages if they can be called without
+    arguments.
+    """
+    def is_page(name: str, value: Any) -> bool:
+        if isinstance(value, Element):
+            return True
+        return value in FUNCTIONS and value.__module__ == module.__name__ and not has_required_parameters(value)
+
+    names: Iterable[str] = getattr(module, '__all__', [name for name in vars(module) if not name.startswith('_')])
+    return {name: getattr(module, name) for name in names if is_page(name, getattr(module, name))}
+
+
+def has_required_parameters(function: Any) -> bool:
+    """
+    Determines if a function has parameters without default values.
+    """
+    for parameter in inspect.signature(function).parameters.values():
+        if parameter.default is inspect.Parameter.empty and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            return True
+    return False
+
+
+def get_outputs(base: Path, pages: Iterable[str]) -> dict[str, str]:
+    """
+    Maps the pages of a module to their output paths (relative to the source
+    directory). Modules which export a single page are written to a file named
+    after the module.
+    """
+    pages = list(pages)
+    if len(pages) == 1:
+        return {pages[0]: str(base.with_suffix(EXTENSION))}
+    return {page: str(base / (page + EXTENSION)) for page in pages}
+
+
+def is_muon(name: str) -> bool:
+    """
+    Determines if a module belongs to muon.
+    """
+    return name == 'muon' or name.startswith('muon.')
+
+
+def is_installed(path: Path) -> bool:
+    """
+    Determines if a file belongs to the standard library or an installed
+    package.
+    """
+    return any(path.is_relative_to(directory) for directory in INSTALLED)
+
+
+def get_source(module: ModuleType, root: Path) -> Path | None:
+    """
+    Returns the source file of a module if it is under the root (and is not
+    an installed package).
+    """
+    file = getattr(module, '__file__', None)
+    if file is not None:
+        path = Path(file).resolve()
+        if path.is_relative_to(root) and not is_installed(path):
+            return path
+    return None
+
+
+def get_inputs(root: Path, module: ModuleType | None = None) -> dict[str, str | None]:
+    """
+    Hashes the source files under the root which have been imported, along
+    with any files a module lists in `INPUTS` (relative to the root).
+    """
+    paths = set()
+
+    for loaded in list(sys.modules.values()):
+        path = get_source(loaded, root)
+        if path is not None:
+            paths.add(path)
+
+    for relative in getattr(module, 'INPUTS', ()):
+        paths.add((root / relative).resolve())
+
+    return {str(path.relative_to(root)): hash_source(path) for path in sorted(paths)}
+
+
+def initialize(root: Path) -> None:
+    """
+    Prepares a worker process to import page modules.
+    """
+    sys.path.insert(0, str(root))
+
+
+def build_module(root: Path, source: Path, output: Path, name: str, previous: dict[str, str]) -> tuple[str, dict[str, Any]]:
+    """
+    Imports a page module and renders each of its pages. Pages are only
+    written if their content has changed.
+    """
+    # Modules under the root are reloaded so that only the inputs of this
+    # module are tracked (muon itself must never be reloaded)
+    for loaded in [k for k, v in sys.modules.items() if get_source(v, root) is not None and not is_muon(k)]:
+        del sys.modules[loaded]
+
+    module = importlib.import_module(name)
+    pages = get_pages(module)
+    outputs = {}
+
+    base = Path(*name.split('.')).relative_to(source.relative_to(root))
+
+    for page, path in get_outputs(base, pages).items():
+        node = pages[page]
+        if not isinstance(node, Element):
+            node = node()
+
+        with spool(node) as file:
+            digest = hashlib.file_digest(file, 'sha256').hexdigest()
+
+            if previous.get(path) != digest or not (output / path).exists():
+                (output / path).parent.mkdir(parents=True, exist_ok=True)
+                file.seek(0)
+                with open(output / path, 'wb') as target:
+                    while data := file.read(1 << 20):
+                        target.write(data)
+
+        outputs[path] = digest
+
+    return name, {'inputs': get_inputs(root, module), 'outputs': outputs}
+
+
+def is_current(root: Path, output: Path, entry: dict[str, Any], hashes: dict[str, str | None]) -> bool:
+    """
+    Determines if the outputs of a module are up to date.
+    """
+    for path, digest in entry['inputs'].items():
+        if path not in hashes:
+            hashes[path] = hash_file(root / path)
+        if hashes[path] != digest:
+            return False
+    return all((output / path).exists() for path in entry['outputs'])
+
+
+def build(source: str | Path, output: str | Path, root: str | Path = '.', jobs: int | None = None, force: bool = False) -> dict[str, list[str]]:
+    """
+    Renders the pages exported by the modules in a source directory (which
+    must be importable from the root directory) into an output directory.
+    Modules are rendered in parallel, and modules whose sources and inputs are
+    unchanged since the last build are skipped.
+    """
+    root = Path(root).resolve()
+    source = Path(source).resolve()
+    output = Path(output).resolve()
+    version = get_version()
+
+    if not source.is_relative_to(root):
+        raise ValueError('the source directory must be under the root directory')
+
+    try:
+        manifest = json.loads((output / MANIFEST).read_text())
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+
+    if force or manifest.get('version') != version:
+        manifest = {'version': version, 'modules': {}}
+
+    entries: dict[str, Any] = manifest['modules']
+    names = discover(source, root)
+    hashes: dict[str, str | None] = {}
+    dirty = [name for name in names if name not in entries or not is_current(root, output, entries[name], hashes)]
+    result: dict[str, list[str]] = {'built': [], 'skipped': [], 'removed': []}
+
+    # Outputs of removed modules are deleted
+    for name in [name for name in entries if name not in names]:
+        for path in entries.pop(name)['outputs']:
+            (output / path).unlink(missing_ok=True)
+        result['removed'].append(name)
+
+    try:
+        if dirty:
+            output.mkdir(parents=True, exist_ok=True)
+
+            with ProcessPoolExecutor(jobs, initializer=initialize, initargs=(root,)) as executor:
+                futures = [executor.submit(build_module, root, source, output, name, entries.get(name, {}).get('outputs', {})) for name in dirty]
+                for future in futures:
+                    name, entry = future.result()
+                    for path in set(entries.get(name, {}).get('outputs', ())) - set(entry['outputs']):
+                        (output / path).unlink(missing_ok=True)
+                    entries[name] = entry
+                    result['built'].append(name)
+    finally:
+        # Completed modules are recorded even if another module fails
+        if result['built'] or result['removed']:
+            (output / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    result['skipped'] = [name for name in names if name not in dirty]
+    return result
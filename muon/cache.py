@@ -0,0 +1,299 @@
+import hashlib
+import mmap
+import os
+import struct
+from abc import ABC
+from abc import abstractmethod
+from contextlib import contextmanager
+from muon.core import Renderable
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Iterator
+from typing import TYPE_CHECKING
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+if TYPE_CHECKING:
+    from muon.elements import Safe
+
+__all__ = [
+    'Cache',
+    'SharedCache',
+]
+
+# Sentinel for missing entries
+MISSING = object()
+
+# Shared cache file layout
+MAGIC = b'MUSC'
+FORMAT = 1
+HEADER = struct.Struct('<4sIQIIQQ')
+SLOT = struct.Struct('<QQI4x')
+ENTRY = struct.Struct('<II')
+
+# Number of index slots probed for each key
+PROBES = 8
+
+
+class FragmentCache(ABC):
+    """
+    Provides fragment caching for caches of rendered strings.
+    """
+
+    @abstractmethod
+    def get(self, key: Any, default: Any = None) -> Any:
+        pass
+
+    @abstractmethod
+    def set(self, key: Any, value: Any) -> None:
+        pass
+
+    def fragment(self, key: Any, render: Callable[[], Renderable]) -> 'Safe':
+        """
+        Returns a rendered HTML fragment, rendering and storing it if
+        necessary.
+        """
+        # Elements depend on caches, so they are imported when needed
+        from muon.elements import render_html_element
+        from muon.elements import Safe
+
+        value = self.get(key)
+        if value is None:
+            value = render_html_element(render())
+            self.set(key, value)
+        return Safe(value)
+
+
+class Cache(FragmentCache):
+    """
+    A thread-safe and size-bounded cache. Entries are spread across shards
+    which are written under their own lock, while reads never take a lock, so
+    threads rendering concurrently do not serialize on the cache (including
+    free-threaded builds, where dictionary operations are atomic). When a
+    shard is full, its oldest entry is evicted.
+    """
+
+    def __init__(self, max_size: int = 4096, shards: int = 16) -> None:
+        self.limit = max(1, max_size // shards)
+        self.shards: list[dict[Hashable, Any]] = [{} for _ in range(shards)]
+        self.locks = [Lock() for _ in range(shards)]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self.shards[hash(key) % len(self.shards)].get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        index = hash(key) % len(self.shards)
+        shard = self.shards[index]
+
+        with self.locks[index]:
+            shard.pop(key, None)
+            shard[key] = value
+            while len(shard) > self.limit:
+                del shard[next(iter(shard))]
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Returns the value of a key, computing and storing it if necessary. The
+        factory may be called by more than one thread for the same key.
+        """
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.shards[hash(key) % len(self.shards)]
+
+    def __len__(self) -> int:
+        return sum(map(len, self.shards))
+
+
+class SharedCache(FragmentCache):
+    """
+    A cache of strings shared between processes through a memory mapped file.
+    Entries are written to a ring buffer, so the oldest entries are evicted
+    once `size` bytes have been written, and an index of `slots` entries maps
+    keys to their location. Opening a cache with a different `version` (or
+    calling `clear`) invalidates every entry, while opening a cache file with
+    a different `size` or number of `slots` raises a `ValueError`. Access is
+    synchronized with file locks, so this cache is only available on POSIX
+    systems.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], size: int = 1 << 26, slots: int = 1 << 16, version: str = '') -> None:
+        if fcntl is None:
+            raise RuntimeError('shared caches require file locking')
+
+        self.path = path
+        self.size = size
+        self.slots = slots
+        self.version = int.from_bytes(hashlib.blake2b(version.encode(), digest_size=8).digest(), 'little')
+        self.lock = Lock()
+        self.pid = -1
+        self.open()
+
+    def open(self) -> None:
+        """
+        Opens (and if necessary, initializes) the cache file. Processes which
+        are forked after opening the cache reopen it, since file locks are
+        shared by inherited file descriptors.
+        """
+        self.file = open(self.path, 'a+b')
+        self.pid = os.getpid()
+        length = HEADER.size + SLOT.size * self.slots + self.size
+
+        with self.locked(fcntl.LOCK_EX):
+            header = os.pread(self.file.fileno(), HEADER.size, 0)
+            compatible = True
+
+            # Files in use by other processes are never resized (which would
+            # invalidate their mappings), so caches of another layout are
+            # refused
+            if len(header) == HEADER.size and header[:len(MAGIC)] != bytes(len(MAGIC)):
+                magic, format, _, slots, _, size, _ = HEADER.unpack(header)
+                compatible = (magic, format, slots, size) == (MAGIC, FORMAT, self.slots, self.size) and os.fstat(self.file.fileno()).st_size == length
+            else:
+                self.file.truncate(length)
+
+            if compatible:
+                self.map = mmap.mmap(self.file.fileno(), length)
+                if not self.is_current():
+                    self.reset()
+
+        if not compatible:
+            self.file.close()
+            raise ValueError('{} is not a shared cache of {} bytes with {} slots'.format(self.path, self.size, self.slots))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        data = key.encode()
+        digest = hash_key(data)
+
+        with self.locked(fcntl.LOCK_SH):
+            if not self.is_current():
+                return default
+
+            head = self.get_head()
+
+            for index in self.probe(digest):
+                slot_digest, position, length = SLOT.unpack_from(self.map, self.get_slot_offset(index))
+
+                # Entries are only valid until they are overwritten
+                if slot_digest == digest and head <= position + self.size:
+                    offset = self.get_data_offset() + position % self.size
+                    key_length, value_length = ENTRY.unpack_from(self.map, offset)
+                    start = offset + ENTRY.size
+
+                    if self.map[start:start + key_length] == data:
+                        return self.map[start + key_length:start + key_length + value_length].decode()
+
+        return default
+
+    def set(self, key: str, value: str) -> None:
+        data = key.encode()
+        encoded = value.encode()
+        entry = ENTRY.pack(len(data), len(encoded)) + data + encoded
+        digest = hash_key(data)
+
+        if len(entry) > self.size:
+            return
+
+        with self.locked(fcntl.LOCK_EX):
+            if not self.is_current():
+                return
+
+            head = self.get_head()
+
+            # Entries are never split across the end of the ring buffer
+            if head % self.size + len(entry) > self.size:
+                head += self.size - head % self.size
+
+            offset = self.get_data_offset() + head % self.size
+            self.map[offset:offset + len(entry)] = entry
+
+            # Reuse the slot of the key, an empty slot, or the oldest slot
+            candidates = []
+            for index in self.probe(digest):
+                slot_digest, position, _ = SLOT.unpack_from(self.map, self.get_slot_offset(index))
+                if slot_digest in (digest, 0):
+                    candidates = [(-1, index)]
+                    break
+                candidates.append((position, index))
+
+            SLOT.pack_into(self.map, self.get_slot_offset(min(candidates)[1]), digest, head, len(entry))
+            self.set_head(head + len(entry))
+
+    def get_or_set(self, key: str, factory: Callable[[], str]) -> str:
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self.locked(fcntl.LOCK_EX):
+            self.reset()
+
+    def close(self) -> None:
+        self.map.close()
+        self.file.close()
+
+    def reset(self) -> None:
+        self.map[:HEADER.size + SLOT.size * self.slots] = bytes(HEADER.size + SLOT.size * self.slots)
+        HEADER.pack_into(self.map, 0, MAGIC, FORMAT, self.version, self.slots, 0, self.size, 0)
+
+    def is_current(self) -> bool:
+        # Processes with an outdated header neither read nor write entries
+        return HEADER.unpack_from(self.map)[:6] == (MAGIC, FORMAT, self.version, self.slots, 0, self.size)
+
+    def probe(self, digest: int) -> Iterator[int]:
+        return ((digest + i) % self.slots for i in range(min(PROBES, self.slots)))
+
+    def get_data_offset(self) -> int:
+        return HEADER.size + SLOT.size * self.slots
+
+    def get_data_size(self) -> int:
+        return HEADER.unpack_from(self.map)[5]
+
+    def get_head(self) -> int:
+        return HEADER.unpack_from(self.map)[6]
+
+    def set_head(self, head: int) -> None:
+        struct.pack_into('<Q', self.map, HEADER.size - 8, head)
+
+    def get_slot_offset(self, index: int) -> int:
+        return HEADER.size + SLOT.size * index
+
+    @contextmanager
+    def locked(self, operation: int) -> Iterator[None]:
+        if self.pid != os.getpid():
+            self.close()
+            self.open()
+
+        with self.lock:
+            fcntl.flock(self.file.fileno(), operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+def hash_key(data: bytes) -> int:
+    """
+    Hashes a key consistently across processes (zero is reserved for empty
+    slots).
+    """
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little') or 1
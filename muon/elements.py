@@ -1,22 +1,42 @@
+import codecs
 import html
+import mmap
+import os
+from contextvars import ContextVar
+from functools import partial
 from functools import wraps
+from itertools import islice
+from types import NoneType
+from muon.cache import Cache
 from muon.core import Renderable
 from typing import Any
 from typing import Callable
+from typing import Hashable
 from typing import Iterable
+from typing import Iterator
 from typing import Mapping
+from typing import TypeGuard
+from weakref import WeakSet
 
 __all__ = [
     # Utilities
     'Safe',
+    'SafeBuffer',
+    'SafeFile',
+    'Interned',
 
     # Decorators
     'element',
     'html_element',
 
+    # Renderers
+    'register_renderer',
+
     # Core Elements
     'Element',
     'HtmlElement',
+    'DeferredElement',
+    'DeferredHtmlElement',
 
     # Sgml Elements
     'DocType',
@@ -148,6 +168,30 @@ STYLE = 'style'
 # Well-known attribute aliases
 ALIASES = {'classes': CLASS}
 
+# Functions defined with the element decorators (and those which are static)
+FUNCTIONS: WeakSet[Callable[..., Any]] = WeakSet()
+STATIC_FUNCTIONS: WeakSet[Callable[..., Any]] = WeakSet()
+
+# Outputs of static functional elements (warmed outputs are never evicted)
+STATIC = Cache(max_size=4096)
+WARMED: dict[Hashable, str] = {}
+
+# Renderers registered for custom node types
+RENDERERS: dict[type, Callable[[Any], str]] = {}
+
+# Registered renderers resolved for exact node types
+REGISTERED: dict[type, Callable[[Any], str] | None] = {}
+
+# Renderers resolved for exact node types
+ELEMENT_RENDERERS: dict[type, Callable[[Any], str]] = {}
+HTML_ELEMENT_RENDERERS: dict[type, Callable[[Any], str]] = {}
+
+# Elements rendered (or streamed) during the current render pass
+MEMO: ContextVar[dict[Any, tuple[Any, 'str | list[Chunk]']] | None] = ContextVar('MEMO', default=None)
+
+# Number of chunks rendered in each step of an incremental render pass
+PASS_BATCH_SIZE = 256
+
 
 def snake_to_kebab(value: str) -> str:
     """
@@ -160,7 +204,7 @@ def escape_html(value: Any, quote: bool = False) -> str:
     """
     Escapes HTML characters in plain strings (excluding quotes).
     """
-    if isinstance(value, str) and not isinstance(value, Safe):
+    if type(value) is str or isinstance(value, str) and not isinstance(value, Safe):
         return html.escape(value, quote)
     return f'{value}'
 
@@ -172,30 +216,254 @@ def escape_html_attribute(value: Any) -> str:
     return escape_html(value, True)
 
 
+def register_renderer(kind: type, renderer: Callable[[Any], str]) -> None:
+    """
+    Registers a renderer for a custom node type (and its subclasses). The
+    output of the renderer is not escaped.
+    """
+    RENDERERS[kind] = renderer
+    REGISTERED.clear()
+    ELEMENT_RENDERERS.clear()
+    HTML_ELEMENT_RENDERERS.clear()
+
+
+def get_registered_renderer(kind: type) -> Callable[[Any], str] | None:
+    """
+    Finds the registered renderer of a node type (if any).
+    """
+    try:
+        return REGISTERED[kind]
+    except KeyError:
+        renderer = next((RENDERERS[base] for base in kind.__mro__ if base in RENDERERS), None)
+        REGISTERED[kind] = renderer
+        return renderer
+
+
+def resolve_renderer(kind: type, html: bool) -> Callable[[Any], str]:
+    """
+    Resolves the renderer of a node type.
+    """
+    renderer = get_registered_renderer(kind)
+
+    if renderer is not None:
+        return renderer
+    elif kind is NoneType:
+        return render_nothing
+    elif issubclass(kind, str):
+        if not html:
+            return render_text
+        elif issubclass(kind, Safe):
+            return str
+        return escape_html
+    elif issubclass(kind, Iterable):
+        if html:
+            return render_html_children
+        return render_children
+    return str
+
+
+def render_nothing(value: None) -> str:
+    return EMPTY
+
+
+def render_text(value: str) -> str:
+    return value
+
+
+def render_children(children: Iterable[Renderable]) -> str:
+    return EMPTY.join(map(render_element, children))
+
+
+def render_html_children(children: Iterable[Renderable]) -> str:
+    return EMPTY.join(map(render_html_element, children))
+
+
 def render_element(children: Renderable) -> str:
     """
     Renders the children of an element.
     """
-    if children is None:
-        return EMPTY
-    elif isinstance(children, str):
-        return children
-    elif isinstance(children, Iterable):
-        return EMPTY.join(map(render_element, children))
-    return str(children)
+    renderer = ELEMENT_RENDERERS.get(type(children))
+    if renderer is None:
+        renderer = ELEMENT_RENDERERS[type(children)] = resolve_renderer(type(children), False)
+    return renderer(children)
 
 
 def render_html_element(children: Renderable) -> str:
     """
     Safely renders the children of an HTML element.
     """
-    if children is None:
-        return EMPTY
+    renderer = HTML_ELEMENT_RENDERERS.get(type(children))
+    if renderer is None:
+        renderer = HTML_ELEMENT_RENDERERS[type(children)] = resolve_renderer(type(children), True)
+    return renderer(children)
+
+
+def iter_element(children: Renderable) -> Iterator['Chunk']:
+    """
+    Incrementally renders the children of an element.
+    """
+    if MEMO.get() is None:
+        return iter_pass(iter_element_chunks(children))
+    return iter_element_chunks(children)
+
+
+def iter_element_chunks(children: Renderable) -> Iterator['Chunk']:
+    renderer = get_registered_renderer(type(children))
+
+    if renderer is not None:
+        yield renderer(children)
+    elif children is None:
+        return
     elif isinstance(children, str):
-        return escape_html(children)
+        yield children
     elif isinstance(children, Iterable):
-        return EMPTY.join(map(render_html_element, children))
-    return str(children)
+        for child in children:
+            yield from iter_element_chunks(child)
+    elif isinstance(children, Element):
+        if renders_structure(children) and not isinstance(children, Interned):
+            yield from children.stream()
+        else:
+            yield from iter_memoized(children)
+    else:
+        yield str(children)
+
+
+def iter_html_element(children: Renderable) -> Iterator['Chunk']:
+    """
+    Safely and incrementally renders the children of an HTML element.
+    """
+    if MEMO.get() is None:
+        return iter_pass(iter_html_element_chunks(children))
+    return iter_html_element_chunks(children)
+
+
+def iter_html_element_chunks(children: Renderable) -> Iterator['Chunk']:
+    renderer = get_registered_renderer(type(children))
+
+    if renderer is not None:
+        yield renderer(children)
+    elif children is None:
+        return
+    elif isinstance(children, str):
+        yield escape_html(children)
+    elif isinstance(children, Iterable):
+        for child in children:
+            yield from iter_html_element_chunks(child)
+    elif isinstance(children, Element):
+        if renders_structure(children) and not isinstance(children, Interned):
+            yield from children.stream()
+        else:
+            yield from iter_memoized(children)
+    else:
+        yield str(children)
+
+
+def iter_pass(chunks: Iterator['Chunk']) -> Iterator['Chunk']:
+    """
+    Opens a render pass around each step of an incremental render, so that the
+    pass is shared by the whole render but never leaks into the consumer.
+    """
+    memo: dict[Any, tuple[Any, str | list[Chunk]]] = {}
+
+    while True:
+        token = MEMO.set(memo)
+        try:
+            batch = list(islice(chunks, PASS_BATCH_SIZE))
+        finally:
+            MEMO.reset(token)
+
+        if not batch:
+            return
+        yield from batch
+
+
+def iter_memoized(node: 'Element') -> Iterator['Chunk']:
+    """
+    Incrementally renders an element at most once per render pass (see
+    `render_memoized`). Repeated elements replay the chunks of their first
+    occurrence.
+    """
+    memo = MEMO.get()
+
+    if memo is None:
+        yield from node.stream()
+        return
+
+    key: Any = node if isinstance(node, Interned) else id(node)
+
+    if key in memo:
+        output = memo[key][1]
+        if isinstance(output, str):
+            yield output
+        else:
+            yield from output
+        return
+
+    chunks = []
+    for chunk in node.stream():
+        chunks.append(chunk)
+        yield chunk
+    memo[key] = (node, chunks)
+
+
+def renders_structure(node: Any) -> TypeGuard['HtmlElement']:
+    """
+    Determines if an HTML element renders its own tag, attributes, and
+    children (as opposed to a component which overrides `render`).
+    """
+    return isinstance(node, HtmlElement) and type(node).render is HtmlElement.render
+
+
+def render_memoized(node: 'Element', renderer: Callable[[Renderable], str]) -> str:
+    """
+    Renders an element at most once per render pass. Components are memoized
+    by identity or, if they are interned, by structure. Plain HTML elements
+    are cheap to format and are not memoized (which would retain the output of
+    every subtree until the end of the pass).
+    """
+    memo = MEMO.get()
+
+    if memo is None:
+        token = MEMO.set({})
+        try:
+            return render_memoized(node, renderer)
+        finally:
+            MEMO.reset(token)
+
+    if renders_structure(node) and not isinstance(node, Interned):
+        return renderer(node.render())
+
+    key: Any = node if isinstance(node, Interned) else id(node)
+
+    if key in memo:
+        output = memo[key][1]
+        if isinstance(output, str):
+            return output
+        # Chunks of a streamed element are already rendered
+        return EMPTY.join(map(str, output))
+
+    text = renderer(node.render())
+    memo[key] = (node, text)
+    return text
+
+
+def freeze(value: Any) -> Any:
+    """
+    Reduces a value to a hashable structure (raising a `TypeError` if the value
+    cannot be reduced).
+    """
+    if isinstance(value, Interned):
+        return value.structure()
+    elif isinstance(value, (str, int, float)) or value is None:
+        return type(value), value
+    elif isinstance(value, (list, tuple)):
+        return tuple, tuple(map(freeze, value))
+    elif isinstance(value, dict):
+        return dict, tuple((k, freeze(v)) for k, v in value.items())
+    elif isinstance(value, Iterator):
+        raise TypeError('iterators cannot be frozen')
+    hash(value)
+    return value
 
 
 def render_html_attribute(key: str, value: Any) -> str:
@@ -262,25 +530,81 @@ def render_html_style(style: Mapping[str, Any]) -> str:
     return SEMICOLON.join([COLON.join([snake_to_kebab(k), v]) for k, v in style.items()])
 
 
-def element(callable: Callable[..., Renderable]) -> Callable[..., str]:
+def get_static_key(function: Callable[..., Any], kwargs: dict[str, Any]) -> Hashable | None:
     """
-    A decorator for defining functional elements.
+    Returns the key of a static functional element's output (or `None` if
+    the arguments cannot be frozen).
     """
-    @wraps(callable)
-    def wrapped(**kwargs: Any) -> str:
-        return render_element(callable(**kwargs))
+    try:
+        key = function, freeze(dict(sorted(kwargs.items())))
+        hash(key)
+        return key
+    except TypeError:
+        return None
 
-    return wrapped
+
+def render_static(function: Callable[..., Any], kwargs: dict[str, Any], render: Callable[[], str]) -> str:
+    """
+    Renders a static functional element once for each distinct set of
+    arguments.
+    """
+    key = get_static_key(function, kwargs)
+    if key is None:
+        return render()
+
+    output = WARMED.get(key)
+    if output is None:
+        output = STATIC.get_or_set(key, render)
+    return output
 
 
-def html_element(callable: Callable[..., Renderable]) -> Callable[..., str]:
+def element(callable: Callable[..., Renderable] | None = None, lazy: bool = False, static: bool = False) -> Any:
     """
-    A decorator for defining functional HTML elements.
+    A decorator for defining functional elements. Lazy elements defer
+    rendering until the tree is walked. Static elements are pure and are
+    rendered once for each distinct set of arguments.
     """
-    @wraps(callable)
-    def wrapped(**kwargs: Any) -> str:
-        return Safe(render_html_element(callable(**kwargs)))
+    if callable is None:
+        return partial(element, lazy=lazy, static=static)
+
+    function = callable
+
+    @wraps(function)
+    def wrapped(**kwargs: Any) -> str | DeferredElement:
+        if static:
+            return render_static(wrapped, kwargs, lambda: render_element(function(**kwargs)))
+        if lazy:
+            return DeferredElement(function, kwargs)
+        return render_element(function(**kwargs))
+
+    FUNCTIONS.add(wrapped)
+    if static:
+        STATIC_FUNCTIONS.add(wrapped)
+    return wrapped
+
 
+def html_element(callable: Callable[..., Renderable] | None = None, lazy: bool = False, static: bool = False) -> Any:
+    """
+    A decorator for defining functional HTML elements. Lazy elements defer
+    rendering until the tree is walked. Static elements are pure and are
+    rendered once for each distinct set of arguments.
+    """
+    if callable is None:
+        return partial(html_element, lazy=lazy, static=static)
+
+    function = callable
+
+    @wraps(function)
+    def wrapped(**kwargs: Any) -> str | DeferredHtmlElement:
+        if static:
+            return render_static(wrapped, kwargs, lambda: Safe(render_html_element(function(**kwargs))))
+        if lazy:
+            return DeferredHtmlElement(function, kwargs)
+        return Safe(render_html_element(function(**kwargs)))
+
+    FUNCTIONS.add(wrapped)
+    if static:
+        STATIC_FUNCTIONS.add(wrapped)
     return wrapped
 
 
@@ -288,13 +612,47 @@ class Safe(str):
     pass
 
 
+class Interned:
+    """
+    A mixin for immutable elements which compares and hashes elements by
+    structure, allowing identical trees to be rendered once per render pass.
+    Elements which cannot be reduced to a structure (such as those containing
+    iterators) are compared and hashed by identity.
+    """
+    __structure: Any = None
+
+    def structure(self) -> Any:
+        if self.__structure is None:
+            self.__structure = type(self), freeze({k: v for k, v in vars(self).items() if k != '_Interned__structure'})
+        return self.__structure
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Interned):
+            return False
+        try:
+            return self.structure() == other.structure()
+        except TypeError:
+            return False
+
+    def __hash__(self) -> int:
+        try:
+            return hash(self.structure())
+        except TypeError:
+            return id(self)
+
+
 class Element:
 
     def render(self) -> Renderable:
         return None
 
+    def stream(self) -> Iterator['Chunk']:
+        return iter_element(self.render())
+
     def __str__(self) -> str:
-        return render_element(self.render())
+        return render_memoized(self, render_element)
 
 
 class DocType(Element):
@@ -313,10 +671,11 @@ class DocType(Element):
 
 class HtmlElement(Element):
 
-    def __init__(self, tag: str | None = None, void: bool = False, children: Renderable = None, **attributes: Any) -> None:
+    def __init__(self, tag: str | None = None, void: bool = False, children: Renderable = None, key: Any = None, **attributes: Any) -> None:
         self.tag = tag
         self.void = void
         self.children = children
+        self.key = key
         self.attributes = attributes
 
     def render(self) -> Renderable:
@@ -333,8 +692,94 @@ class HtmlElement(Element):
 
         return Safe(get_format().format(**options))
 
+    def stream(self) -> Iterator['Chunk']:
+        if not renders_structure(self):
+            yield from iter_html_element(self.render())
+        elif self.void:
+            yield '<{}{}/>'.format(self.tag, render_html_attributes(self.attributes))
+        else:
+            yield '<{}{}>'.format(self.tag, render_html_attributes(self.attributes))
+            yield from iter_html_element(self.children)
+            yield '</{}>'.format(self.tag)
+
     def __str__(self) -> str:
-        return render_html_element(self.render())
+        return render_memoized(self, render_html_element)
+
+
+class DeferredElement(Element):
+
+    def __init__(self, callable: Callable[..., Renderable], kwargs: dict[str, Any]) -> None:
+        self.callable = callable
+        self.kwargs = kwargs
+
+    def render(self) -> Renderable:
+        return self.callable(**self.kwargs)
+
+
+class DeferredHtmlElement(HtmlElement):
+
+    def __init__(self, callable: Callable[..., Renderable], kwargs: dict[str, Any]) -> None:
+        self.callable = callable
+        self.kwargs = kwargs
+
+    def render(self) -> Renderable:
+        return self.callable(**self.kwargs)
+
+
+class SafeBuffer(Element):
+    """
+    Pre-rendered output held in a bytes-like object (such as `bytes` or an
+    `mmap`). Byte-oriented renderers copy the buffer directly into their output
+    without decoding it, while other renderers decode it as a `Safe` string.
+    """
+
+    def __init__(self, buffer: Any, encoding: str = 'utf-8') -> None:
+        self.buffer = buffer
+        self.encoding = encoding
+
+    def view(self) -> memoryview:
+        return memoryview(self.buffer)
+
+    def render(self) -> Renderable:
+        return Safe(str(self.view(), self.encoding))
+
+    def stream(self) -> Iterator['Chunk']:
+        yield self
+
+    def is_encoded(self, encoding: str) -> bool:
+        """
+        Determines if the buffer can be copied into output of an encoding as-is.
+        """
+        return codecs.lookup(self.encoding).name == codecs.lookup(encoding).name
+
+    def encode(self, encoding: str = 'utf-8') -> memoryview | bytes:
+        """
+        Returns the buffer in an encoding, transcoding it if necessary.
+        """
+        if self.is_encoded(encoding):
+            return self.view()
+        return str(self.view(), self.encoding).encode(encoding)
+
+
+class SafeFile(SafeBuffer):
+    """
+    Pre-rendered output held in a file, which is mapped into memory when it is
+    rendered (or passed to `os.sendfile` when possible).
+    """
+
+    def __init__(self, path: str | os.PathLike[str], encoding: str = 'utf-8') -> None:
+        self.path = path
+        self.encoding = encoding
+
+    def view(self) -> memoryview:
+        with open(self.path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return memoryview(b'')
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+# Incremental output of an element
+Chunk = str | SafeBuffer
 
 
 class Anchor(HtmlElement):
@@ -0,0 +1,49 @@
+from muon.core import Renderable
+from muon.elements import Element
+from muon.elements import HtmlElement
+from muon.elements import renders_structure
+from muon.elements import SafeBuffer
+from typing import Any
+from typing import Iterable
+
+__all__ = [
+    'find',
+    'render_fragment',
+]
+
+
+def find(node: Renderable, id: str | None = None, key: Any = None) -> Element | None:
+    """
+    Finds the first element with the given `id` attribute or `key` (searching
+    depth first). Components are only evaluated until a match is found.
+    """
+    if node is None or isinstance(node, str):
+        return None
+    elif isinstance(node, Iterable):
+        for child in node:
+            match = find(child, id, key)
+            if match is not None:
+                return match
+        return None
+    elif isinstance(node, HtmlElement):
+        if key is not None and getattr(node, 'key', None) == key:
+            return node
+        # Components may still have attributes (such as those of a script)
+        elif id is not None and getattr(node, 'attributes', {}).get('id') == id:
+            return node
+        elif renders_structure(node):
+            return find(node.children, id, key)
+    if isinstance(node, Element) and not isinstance(node, SafeBuffer):
+        return find(node.render(), id, key)
+    return None
+
+
+def render_fragment(node: Renderable, id: str | None = None, key: Any = None) -> str | None:
+    """
+    Renders only the first element with the given `id` attribute or `key`,
+    returning `None` if no element matches.
+    """
+    match = find(node, id, key)
+    if match is not None:
+        return str(match)
+    return None
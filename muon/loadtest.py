@@ -0,0 +1,210 @@
+import argparse
+import gc
+import importlib
+import json
+import math
+import platform
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from muon.benchmark import render
+from muon.benchmark import TREES
+from muon.build import get_version
+from muon.core import Renderable
+from typing import Any
+from typing import Callable
+
+# Reported latency percentiles
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+class Collector:
+    """
+    Accumulates the time spent in garbage collection by a process.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.collections = 0
+        self.pause = 0.0
+        self.started = 0.0
+
+    def __call__(self, phase: str, info: dict[str, Any]) -> None:
+        if phase == 'start':
+            self.started = time.perf_counter()
+        elif phase == 'stop':
+            with self.lock:
+                self.collections += 1
+                self.pause += time.perf_counter() - self.started
+
+    def __enter__(self) -> 'Collector':
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        gc.callbacks.remove(self)
+
+
+def get_tree(name: str) -> Callable[[], Renderable]:
+    """
+    Returns a standard tree or a factory given as `module:function`.
+    """
+    if name in TREES:
+        return TREES[name]
+
+    module, _, function = name.partition(':')
+    if not function:
+        raise ValueError('unknown tree: {}'.format(name))
+    return getattr(importlib.import_module(module), function)
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """
+    Parses a weighted mix of trees (such as `page=3,table=1`).
+    """
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.strip().partition('=')
+        mix[name] = float(weight or 1)
+        if mix[name] <= 0:
+            raise ValueError('weights must be positive: {}'.format(item))
+    return mix
+
+
+def run(mix: dict[str, float], duration: float, seed: int) -> dict[str, list[int]]:
+    """
+    Renders trees chosen from a mix until the duration has elapsed, returning
+    the latencies of each tree (in nanoseconds).
+    """
+    trees = {name: get_tree(name) for name in mix}
+    names = list(mix)
+    weights = list(mix.values())
+    choose = random.Random(seed).choices
+    latencies: dict[str, list[int]] = {name: [] for name in names}
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        name = choose(names, weights)[0]
+        start = time.perf_counter_ns()
+        render(trees[name]())
+        latencies[name].append(time.perf_counter_ns() - start)
+
+    return latencies
+
+
+def run_process(mix: dict[str, float], duration: float, seed: int) -> tuple[dict[str, list[int]], int, float]:
+    """
+    Runs a worker in its own process, including its garbage collection time.
+    """
+    with Collector() as collector:
+        latencies = run(mix, duration, seed)
+    return latencies, collector.collections, collector.pause
+
+
+def summarize(latencies: list[int], duration: float) -> dict[str, float]:
+    """
+    Summarizes the throughput and latency percentiles (in milliseconds) of a
+    set of renders.
+    """
+    latencies = sorted(latencies)
+    summary = {
+        'renders': len(latencies),
+        'throughput': len(latencies) / duration,
+    }
+    for percentile in PERCENTILES:
+        index = max(0, math.ceil(percentile / 100 * len(latencies)) - 1)
+        summary['p{}'.format(str(percentile).replace('.', ''))] = latencies[index] / 1e6 if latencies else 0.0
+    return summary
+
+
+def loadtest(mix: dict[str, float], workers: int = 1, duration: float = 10.0, processes: bool = False, seed: int = 0) -> dict[str, Any]:
+    """
+    Renders a weighted mix of trees across threads or processes for a fixed
+    duration, returning throughput, latency percentiles, and the time spent in
+    garbage collection.
+    """
+    latencies: dict[str, list[int]] = {name: [] for name in mix}
+    collections = 0
+    pause = 0.0
+
+    if processes:
+        with ProcessPoolExecutor(workers) as executor:
+            for result, count, seconds in executor.map(run_process, [mix] * workers, [duration] * workers, range(seed, seed + workers)):
+                for name, values in result.items():
+                    latencies[name] += values
+                collections += count
+                pause += seconds
+        # Each process collects independently, so pauses overlap in time
+        pause /= workers
+    else:
+        with Collector() as collector, ThreadPoolExecutor(workers) as executor:
+            for result in executor.map(run, [mix] * workers, [duration] * workers, range(seed, seed + workers)):
+                for name, values in result.items():
+                    latencies[name] += values
+        collections = collector.collections
+        pause = collector.pause
+
+    return {
+        'muon': get_version(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'gil': getattr(sys, '_is_gil_enabled', lambda: True)(),
+        'mode': 'processes' if processes else 'threads',
+        'workers': workers,
+        'duration': duration,
+        'mix': mix,
+        'total': summarize([v for values in latencies.values() for v in values], duration),
+        'trees': {name: summarize(values, duration) for name, values in latencies.items()},
+        'gc': {
+            'collections': collections,
+            'pause': pause,
+            'fraction': pause / duration,
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m muon.loadtest', description='Renders a mix of trees under concurrent load.')
+    parser.add_argument('--mix', default='page', help='weighted trees to render: {} or module:function (default: page)'.format(', '.join(TREES)))
+    parser.add_argument('--threads', type=int, default=0, help='number of worker threads')
+    parser.add_argument('--processes', type=int, default=0, help='number of worker processes')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to render for (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for choosing trees')
+    parser.add_argument('--json', help='file to write results to (- for standard output)')
+    arguments = parser.parse_args()
+
+    if arguments.threads and arguments.processes:
+        parser.error('--threads and --processes cannot be combined')
+
+    try:
+        mix = parse_mix(arguments.mix)
+        for name in mix:
+            get_tree(name)
+    except (ValueError, ImportError, AttributeError) as error:
+        parser.error(str(error))
+
+    results = loadtest(mix, arguments.processes or arguments.threads or 1, arguments.duration, bool(arguments.processes), arguments.seed)
+
+    if arguments.json == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return 0
+
+    for name, summary in [('total', results['total']), *results['trees'].items()]:
+        print('{:<12} renders={:,} throughput={:,.1f}/s p50={:.3f}ms p95={:.3f}ms p99={:.3f}ms p999={:.3f}ms'.format(
+            name, summary['renders'], summary['throughput'], summary['p50'], summary['p95'], summary['p99'], summary['p999'],
+        ))
+    print('gc collections={:,} pause={:.3f}s ({:.1%} of duration)'.format(results['gc']['collections'], results['gc']['pause'], results['gc']['fraction']))
+
+    if arguments.json:
+        with open(arguments.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import inspect
+from functools import partial
+from muon.core import Renderable
+from muon.elements import Element
+from muon.elements import EMPTY
+from muon.elements import get_registered_renderer
+from muon.elements import HtmlElement
+from muon.elements import render_element
+from muon.elements import render_html_attributes
+from muon.elements import render_html_element
+from muon.elements import renders_structure
+from muon.elements import Safe
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+__all__ = [
+    'Hole',
+    'Prototype',
+]
+
+# Parameters which cannot be filled by name
+VARIADIC = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
+
+class Hole:
+    """
+    A placeholder for a parameter of a prototype. Holes can be used as children
+    or attribute values (including within class lists and style dictionaries),
+    but they cannot be rendered or inspected while the prototype is compiled.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return 'Hole({!r})'.format(self.name)
+
+    def __str__(self) -> str:
+        raise TypeError('hole {!r} cannot be rendered outside of a child or attribute value'.format(self.name))
+
+    def __format__(self, spec: str) -> str:
+        return str(self)
+
+    def __bool__(self) -> bool:
+        raise TypeError('hole {!r} cannot be inspected while compiling a prototype'.format(self.name))
+
+
+def has_hole(value: Any) -> bool:
+    """
+    Determines if an attribute value contains a hole.
+    """
+    if isinstance(value, Hole):
+        return True
+    elif isinstance(value, (list, tuple)):
+        return any(map(has_hole, value))
+    elif isinstance(value, dict):
+        return any(map(has_hole, value.values()))
+    return False
+
+
+def fill(value: Any, values: dict[str, Any]) -> Any:
+    """
+    Replaces the holes of an attribute value.
+    """
+    if isinstance(value, Hole):
+        return values[value.name]
+    elif isinstance(value, (list, tuple)):
+        return type(value)(fill(v, values) for v in value)
+    elif isinstance(value, dict):
+        return {k: fill(v, values) for k, v in value.items()}
+    return value
+
+
+def fill_child(name: str, render: Callable[[Renderable], str], values: dict[str, Any]) -> str:
+    return render(values[name])
+
+
+def fill_attributes(attributes: dict[str, Any], values: dict[str, Any]) -> str:
+    return render_html_attributes(fill(attributes, values))
+
+
+class Prototype:
+    """
+    A template of an element tree which is built once and rendered many times
+    with different parameters, without building a new tree each time. The
+    builder is called with a `Hole` for each of its parameters, and the result
+    is compiled into static text and holes. Calling the prototype with keyword
+    arguments returns the same output as rendering the builder's tree.
+    Builders must not branch on or transform their parameters (which should be
+    passed to the prototype ready to render).
+    """
+
+    def __init__(self, builder: Callable[..., Renderable]) -> None:
+        self.parameters = inspect.signature(builder).parameters
+        self.names = frozenset(self.parameters)
+        self.defaults = {}
+        self.parts: list[str] = []
+        self.slots: list[tuple[int, Callable[[dict[str, Any]], str]]] = []
+
+        for name, parameter in self.parameters.items():
+            if parameter.kind in VARIADIC:
+                raise TypeError('prototypes cannot have variadic parameters')
+            if parameter.default is not inspect.Parameter.empty:
+                self.defaults[name] = parameter.default
+
+        self.compile(builder(**{name: Hole(name) for name in self.parameters}), True)
+
+    def compile(self, node: Renderable, html: bool) -> None:
+        """
+        Compiles a node into static text and holes.
+        """
+        if get_registered_renderer(type(node)) is not None:
+            self.add(render_html_element(node) if html else render_element(node))
+        elif isinstance(node, Hole):
+            self.add_slot(partial(fill_child, node.name, render_html_element if html else render_element))
+        elif isinstance(node, HtmlElement) and renders_structure(node):
+            self.add('<{}'.format(node.tag))
+
+            if any(map(has_hole, node.attributes.values())):
+                # Attributes are rendered together so that spacing is unchanged
+                self.add_slot(partial(fill_attributes, node.attributes))
+            else:
+                self.add(render_html_attributes(node.attributes))
+
+            if node.void:
+                self.add('/>')
+            else:
+                self.add('>')
+                self.compile(node.children, True)
+                self.add('</{}>'.format(node.tag))
+        elif isinstance(node, Element):
+            self.compile(node.render(), isinstance(node, HtmlElement))
+        elif isinstance(node, Iterable) and not isinstance(node, str):
+            for child in node:
+                self.compile(child, html)
+        else:
+            self.add(render_html_element(node) if html else render_element(node))
+
+    def add(self, text: str) -> None:
+        # Adjacent static text is merged
+        if self.parts and (not self.slots or self.slots[-1][0] != len(self.parts) - 1):
+            self.parts[-1] += text
+        else:
+            self.parts.append(text)
+
+    def add_slot(self, render: Callable[[dict[str, Any]], str]) -> None:
+        self.slots.append((len(self.parts), render))
+        self.parts.append(EMPTY)
+
+    def __call__(self, **kwargs: Any) -> Safe:
+        values = {**self.defaults, **kwargs} if self.defaults else kwargs
+
+        if values.keys() != self.names:
+            missing = [name for name in self.parameters if name not in values]
+            unknown = [name for name in values if name not in self.parameters]
+            raise TypeError('invalid prototype arguments (missing: {}, unknown: {})'.format(missing, unknown))
+
+        parts = self.parts.copy()
+        for index, render in self.slots:
+            parts[index] = render(values)
+        return Safe(EMPTY.join(parts))
@@ -0,0 +1,88 @@
+import zlib
+from muon.elements import Chunk
+from muon.elements import SafeBuffer
+from typing import Iterable
+
+# Default content type of responses
+CONTENT_TYPE = 'text/html; charset=utf-8'
+
+# Compression level of gzip responses
+LEVEL = 6
+
+
+class BodyEncoder:
+    """
+    Encodes (and optionally compresses) the chunks of a response body.
+    """
+
+    def __init__(self, encoding: str, gzip: bool) -> None:
+        self.encoding = encoding
+        self.compressor = zlib.compressobj(LEVEL, zlib.DEFLATED, 31) if gzip else None
+
+    def encode(self, chunk: Chunk) -> bytes:
+        data = chunk.encode(self.encoding)
+        if self.compressor is not None:
+            # Flush each chunk so that clients can begin processing it
+            return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        return bytes(data)
+
+    def finish(self) -> bytes:
+        if self.compressor is not None:
+            return self.compressor.flush()
+        return b''
+
+    def encode_all(self, chunks: Iterable[Chunk]) -> bytes:
+        data = b''.join(chunk.encode(self.encoding) for chunk in chunks)
+        if self.compressor is not None:
+            return self.compressor.compress(data) + self.compressor.flush()
+        return data
+
+
+def get_length(chunk: Chunk) -> int:
+    """
+    Returns the length of a chunk (in characters or bytes).
+    """
+    if isinstance(chunk, SafeBuffer):
+        return chunk.view().nbytes
+    return len(chunk)
+
+
+def accepts_gzip(value: str | None) -> bool:
+    """
+    Determines if an `Accept-Encoding` header allows gzip.
+    """
+    accepted = False
+
+    for item in (value or '').lower().split(','):
+        name, _, parameters = item.partition(';')
+        name = name.strip()
+        quality = 1.0
+
+        for parameter in parameters.split(';'):
+            key, _, number = parameter.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+
+        if name == 'gzip':
+            return quality > 0
+        elif name == '*':
+            accepted = quality > 0
+
+    return accepted
+
+
+def get_headers(headers: Iterable[tuple[str, str]], content_type: str, compress: bool, gzip: bool, length: int | None) -> list[tuple[str, str]]:
+    """
+    Builds the headers of a response.
+    """
+    result = [('Content-Type', content_type), *headers]
+    if compress:
+        result.append(('Vary', 'Accept-Encoding'))
+    if gzip:
+        result.append(('Content-Encoding', 'gzip'))
+    if length is not None:
+        result.append(('Content-Length', str(length)))
+    return result
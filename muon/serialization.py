@@ -0,0 +1,350 @@
+import json
+import struct
+import sys
+from array import array
+from muon.core import Renderable
+from muon.elements import EMPTY
+from muon.elements import HtmlElement
+from muon.elements import renders_structure
+from muon.elements import Safe
+from typing import Any
+from typing import Iterable
+
+__all__ = [
+    'dumps',
+    'dumps_json',
+    'loads',
+    'loads_json',
+]
+
+# Binary format header (magic, version, integer typecode, integer count, and
+# text size)
+MAGIC = b'MUON'
+VERSION = 2
+HEADER = struct.Struct('<4sBBII')
+
+# Typecodes of the binary integer stream (from smallest to largest)
+TYPECODES = 'BHIQ'
+
+# Binary value types
+NONE = 0
+TRUE = 1
+FALSE = 2
+INTEGER = 3
+FLOAT = 4
+STRING = 5
+SAFE = 6
+LIST = 7
+DICT = 8
+ELEMENT = 9
+
+# Element parameters which cannot be attribute names
+RESERVED = frozenset(('tag', 'void', 'children'))
+
+# Json format version
+JSON_VERSION = 1
+
+# Json value types
+JSON_SAFE = 's'
+JSON_LIST = 'l'
+JSON_DICT = 'd'
+JSON_ELEMENT = 'e'
+
+
+def get_attributes(node: HtmlElement) -> dict[str, Any]:
+    """
+    Returns the attributes of an element (including its key).
+    """
+    if node.key is not None:
+        return {**node.attributes, 'key': node.key}
+    return node.attributes
+
+
+def get_typecode(value: int) -> str:
+    """
+    Returns the smallest typecode of an integer stream which can hold a value.
+    """
+    for typecode in TYPECODES:
+        if value < 1 << array(typecode).itemsize * 8:
+            return typecode
+    raise ValueError('element tree is too large to serialize')
+
+
+class Table:
+    """
+    Interns tag and attribute names.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.names = list(names)
+        self.indices = {name: i for i, name in enumerate(self.names)}
+
+    def intern(self, name: Any) -> int:
+        name = str(name)
+        index = self.indices.get(name)
+        if index is None:
+            index = self.indices[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+
+class Encoder:
+    """
+    Encodes element trees into the binary format. The structure of a tree is
+    written as a stream of integers and its strings are written together as a
+    single block of text, so both can be packed and unpacked in bulk.
+    """
+
+    def __init__(self) -> None:
+        self.table = Table()
+        self.shapes: dict[tuple[Any, ...], int] = {}
+        self.layouts: list[int] = []
+        self.integers: list[int] = []
+        self.strings: list[str] = []
+
+    def encode(self, value: Any) -> None:
+        write = self.integers.append
+
+        if type(value) is str:
+            write(STRING)
+            write(len(value))
+            self.strings.append(value)
+        elif renders_structure(value):
+            attributes = get_attributes(value)
+            write(ELEMENT)
+            write(self.get_shape(value, attributes))
+            for item in attributes.values():
+                self.encode(item)
+            self.encode(value.children)
+        elif value is None:
+            write(NONE)
+        elif value is True:
+            write(TRUE)
+        elif value is False:
+            write(FALSE)
+        elif isinstance(value, str):
+            write(SAFE if isinstance(value, Safe) else STRING)
+            write(len(value))
+            self.strings.append(value)
+        elif isinstance(value, (int, float)):
+            # Numbers are rare and are written as text to support any size
+            text = repr(value)
+            write(INTEGER if isinstance(value, int) else FLOAT)
+            write(len(text))
+            self.strings.append(text)
+        elif isinstance(value, dict):
+            write(DICT)
+            self.write_mapping(value)
+        elif isinstance(value, Iterable):
+            values = value if isinstance(value, (list, tuple)) else list(value)
+            write(LIST)
+            write(len(values))
+            for item in values:
+                self.encode(item)
+        else:
+            # Components and other nodes are reduced to their output
+            text = str(value)
+            write(SAFE)
+            write(len(text))
+            self.strings.append(text)
+
+    def get_shape(self, node: HtmlElement, attributes: dict[str, Any]) -> int:
+        """
+        Interns the tag, void flag, and attribute names of an element.
+        """
+        shape = node.tag, node.void, *attributes
+        index = self.shapes.get(shape)
+        if index is None:
+            index = self.shapes[shape] = len(self.shapes)
+            self.layouts += [self.table.intern(node.tag), TRUE if node.void else FALSE, len(attributes), *map(self.table.intern, attributes)]
+        return index
+
+    def write_mapping(self, mapping: dict[Any, Any]) -> None:
+        self.integers.append(len(mapping))
+        for key, value in mapping.items():
+            self.integers.append(self.table.intern(key))
+            self.encode(value)
+
+    def getvalue(self) -> bytes:
+        names = self.table.names
+        values = [len(names), *map(len, names), len(self.shapes), *self.layouts, *self.integers]
+        integers = array(get_typecode(max(values)), values)
+        text = EMPTY.join(names + self.strings).encode()
+
+        if sys.byteorder == 'big':
+            integers.byteswap()
+
+        header = HEADER.pack(MAGIC, VERSION, ord(integers.typecode), len(integers), len(text))
+        return header + integers.tobytes() + text
+
+
+class Decoder:
+    """
+    Decodes element trees from the binary format.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        if len(data) < HEADER.size:
+            raise ValueError('invalid muon data')
+
+        magic, version, typecode, count, size = HEADER.unpack_from(data)
+
+        if magic != MAGIC:
+            raise ValueError('invalid muon data')
+        if version != VERSION:
+            raise ValueError('unsupported muon data version')
+        if chr(typecode) not in TYPECODES or HEADER.size + count * array(chr(typecode)).itemsize + size != len(data):
+            raise ValueError('invalid muon data')
+
+        integers = array(chr(typecode))
+        integers.frombytes(data[HEADER.size:len(data) - size])
+
+        if sys.byteorder == 'big':
+            integers.byteswap()
+
+        self.integers = iter(integers)
+        self.read = self.integers.__next__
+        self.text = str(data[len(data) - size:], 'utf-8')
+        self.position = 0
+        self.table = Table([self.read_string() for _ in range(self.read())])
+        self.shapes = [self.read_shape() for _ in range(self.read())]
+
+    def decode(self) -> Any:
+        kind = self.read()
+
+        if kind == STRING:
+            return self.read_string()
+        elif kind == ELEMENT:
+            tag, void, keys = self.shapes[self.read()]
+            attributes = {key: self.decode() for key in keys}
+            return HtmlElement(tag=tag, void=void, children=self.decode(), **attributes)
+        elif kind == LIST:
+            return [self.decode() for _ in range(self.read())]
+        elif kind == SAFE:
+            return Safe(self.read_string())
+        elif kind == NONE:
+            return None
+        elif kind == TRUE:
+            return True
+        elif kind == FALSE:
+            return False
+        elif kind == INTEGER:
+            return int(self.read_string())
+        elif kind == FLOAT:
+            return float(self.read_string())
+        elif kind == DICT:
+            return self.read_mapping()
+        raise ValueError('invalid muon data')
+
+    def read_shape(self) -> tuple[str, bool, tuple[str, ...]]:
+        names = self.table.names
+        tag = names[self.read()]
+        void = self.read() == TRUE
+        keys = tuple([names[self.read()] for _ in range(self.read())])
+
+        if RESERVED.intersection(keys):
+            raise ValueError('invalid muon data')
+        return tag, void, keys
+
+    def read_mapping(self) -> dict[str, Any]:
+        count = self.read()
+        if count == 0:
+            return {}
+        names = self.table.names
+        return {names[self.read()]: self.decode() for _ in range(count)}
+
+    def read_string(self) -> str:
+        start = self.position
+        self.position += self.read()
+        return self.text[start:self.position]
+
+    def is_complete(self) -> bool:
+        return self.position == len(self.text) and next(self.integers, None) is None
+
+
+def dumps(node: Renderable) -> bytes:
+    """
+    Serializes an element tree into a compact binary format. Components and
+    other nodes which do not render their own structure are reduced to `Safe`
+    fragments of their output.
+    """
+    encoder = Encoder()
+    encoder.encode(node)
+    return encoder.getvalue()
+
+
+def loads(data: bytes) -> Renderable:
+    """
+    Deserializes an element tree from the binary format.
+    """
+    try:
+        decoder = Decoder(data)
+        node = decoder.decode()
+    except (IndexError, RecursionError, StopIteration, TypeError):
+        raise ValueError('invalid muon data') from None
+
+    if not decoder.is_complete():
+        raise ValueError('invalid muon data')
+    return node
+
+
+def dumps_json(node: Renderable) -> str:
+    """
+    Serializes an element tree into a compact json format.
+    """
+    table = Table()
+
+    def encode(value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        elif isinstance(value, str):
+            return [JSON_SAFE, str(value)] if isinstance(value, Safe) else value
+        elif isinstance(value, dict):
+            return [JSON_DICT, encode_mapping(value)]
+        elif renders_structure(value):
+            return [JSON_ELEMENT, table.intern(value.tag), value.void, encode_mapping(get_attributes(value)), encode(value.children)]
+        elif isinstance(value, Iterable):
+            return [JSON_LIST, [encode(item) for item in value]]
+        return [JSON_SAFE, str(value)]
+
+    def encode_mapping(mapping: dict[Any, Any]) -> list[Any]:
+        return [[table.intern(k), encode(v)] for k, v in mapping.items()]
+
+    root = encode(node)
+    return json.dumps({'version': JSON_VERSION, 'table': table.names, 'root': root}, separators=(',', ':'))
+
+
+def loads_json(text: str | bytes) -> Renderable:
+    """
+    Deserializes an element tree from the json format.
+    """
+    document = json.loads(text)
+
+    if not isinstance(document, dict) or document.get('version') != JSON_VERSION:
+        raise ValueError('unsupported muon data version')
+
+    table = document['table']
+
+    def decode(value: Any) -> Any:
+        if not isinstance(value, list):
+            return value
+        elif value[0] == JSON_SAFE:
+            return Safe(value[1])
+        elif value[0] == JSON_LIST:
+            return [decode(item) for item in value[1]]
+        elif value[0] == JSON_DICT:
+            return decode_mapping(value[1])
+        elif value[0] == JSON_ELEMENT:
+            attributes = decode_mapping(value[3])
+            if RESERVED.intersection(attributes):
+                raise ValueError('invalid muon data')
+            return HtmlElement(tag=table[value[1]], void=value[2], children=decode(value[4]), **attributes)
+        raise ValueError('invalid muon data')
+
+    def decode_mapping(pairs: list[Any]) -> dict[str, Any]:
+        return {table[k]: decode(v) for k, v in pairs}
+
+    try:
+        return decode(document['root'])
+    except (IndexError, KeyError, TypeError):
+        raise ValueError('invalid muon data') from None
@@ -0,0 +1,259 @@
+import asyncio
+import inspect
+import os
+from contextvars import ContextVar
+from muon.analysis import analyze
+from muon.analysis import LimitExceeded
+from muon.core import Node
+from muon.core import Renderable
+from muon.elements import Chunk
+from muon.elements import EMPTY
+from muon.elements import HtmlElement
+from muon.elements import iter_html_element
+from muon.elements import Safe
+from muon.elements import SafeBuffer
+from muon.elements import SafeFile
+from muon.elements import Template
+from tempfile import SpooledTemporaryFile
+from typing import Any
+from typing import AsyncGenerator
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Iterator
+
+__all__ = [
+    'Suspense',
+    'astream',
+    'spool',
+    'stream',
+]
+
+# Default number of characters coalesced into a single chunk
+CHUNK_SIZE = 1 << 16
+
+# Default number of bytes held in memory before spilling to disk
+SPOOL_SIZE = 1 << 24
+
+# Default output encoding
+ENCODING = 'utf-8'
+
+# Replaces a suspense placeholder with its resolved template
+SWAP = (
+    '(function(){{'
+    'var p=document.getElementById("muon-suspense-{0}"),t=document.getElementById("muon-resolved-{0}");'
+    'if(p&&t){{p.replaceWith(t.content);t.remove()}}'
+    'document.currentScript.remove()'
+    '}})()'
+)
+
+
+class Suspended:
+    """
+    Tracks the suspended elements of an asynchronous render.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.tasks: set[asyncio.Task[tuple[int, Renderable]]] = set()
+
+    def suspend(self, children: Any) -> int:
+        async def resolve(ident: int) -> tuple[int, Renderable]:
+            awaitable = children() if callable(children) else children
+            return ident, await awaitable
+
+        ident = self.count
+        self.count += 1
+        self.tasks.add(asyncio.ensure_future(resolve(ident)))
+        return ident
+
+    def pull(self, iterator: Iterator[Chunk]) -> Chunk | None:
+        token = SUSPENDED.set(self)
+        try:
+            return next(iterator, None)
+        finally:
+            SUSPENDED.reset(token)
+
+
+# Suspended elements of the current asynchronous render
+SUSPENDED: ContextVar[Suspended | None] = ContextVar('SUSPENDED', default=None)
+
+
+class Suspense(HtmlElement):
+    """
+    Renders a fallback in place of slow children. When streamed with
+    `astream`, the children are awaited concurrently and swapped in as they
+    resolve. Otherwise, only the fallback is rendered (and the children are
+    left pending).
+    """
+
+    def __init__(self, fallback: Renderable = None, children: Awaitable[Renderable] | Callable[[], Awaitable[Renderable]] | None = None) -> None:
+        self.fallback = fallback
+        self.pending = children
+
+    def render(self) -> Renderable:
+        return self.fallback
+
+    def __del__(self) -> None:
+        # Children which were never awaited are closed without a warning
+        if inspect.iscoroutine(self.pending) and inspect.getcoroutinestate(self.pending) == inspect.CORO_CREATED:
+            self.pending.close()
+
+    def stream(self) -> Iterator[Chunk]:
+        suspended = SUSPENDED.get()
+
+        if suspended is None or self.pending is None:
+            yield from iter_html_element(self.render())
+        else:
+            ident = suspended.suspend(self.pending)
+            yield '<muon-suspense id="muon-suspense-{}">'.format(ident)
+            yield from iter_html_element(self.fallback)
+            yield '</muon-suspense>'
+
+
+def iter_chunks(node: Renderable, size: int) -> Iterator[Chunk]:
+    """
+    Coalesces the incremental output of a node into chunks of at least `size`
+    characters (except for the last chunk and any text preceding a buffer).
+    Buffers are passed through without being decoded.
+    """
+    buffer: list[str] = []
+    length = 0
+
+    for chunk in iter_html_element(node):
+        if isinstance(chunk, SafeBuffer):
+            if buffer:
+                yield EMPTY.join(buffer)
+                buffer.clear()
+                length = 0
+            yield chunk
+            continue
+
+        buffer.append(chunk)
+        length += len(chunk)
+
+        if length >= size:
+            yield EMPTY.join(buffer)
+            buffer.clear()
+            length = 0
+
+    if buffer:
+        yield EMPTY.join(buffer)
+
+
+def to_text(chunk: Chunk) -> str:
+    """
+    Decodes a chunk (if necessary).
+    """
+    if isinstance(chunk, SafeBuffer):
+        return str(chunk)
+    return chunk
+
+
+def stream(node: Renderable, size: int = CHUNK_SIZE, **limits: int | None) -> Iterator[str]:
+    """
+    Renders a node incrementally without materializing the entire output. If
+    any limits are given (see `analyze`), the tree is analyzed before rendering.
+    """
+    if any(limit is not None for limit in limits.values()):
+        analyze(node, **limits)
+    return map(to_text, iter_chunks(node, size))
+
+
+async def astream(node: Renderable, size: int = CHUNK_SIZE) -> AsyncIterator[str]:
+    """
+    Renders a node incrementally, flushing placeholders for `Suspense`
+    elements and emitting their children (with an inline swap script) in the
+    order they resolve.
+    """
+    async for chunk in iter_suspended(node, size, Suspended()):
+        yield to_text(chunk)
+
+
+async def iter_suspended(node: Renderable, size: int, suspended: Suspended) -> AsyncGenerator[Chunk, None]:
+    """
+    Renders a node incrementally, tracking suspended elements with the given
+    tracker (see `astream`).
+    """
+    try:
+        chunks = iter_chunks(node, size)
+        while (chunk := suspended.pull(chunks)) is not None:
+            yield chunk
+
+        while suspended.tasks:
+            done, _ = await asyncio.wait(suspended.tasks, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                suspended.tasks.remove(task)
+                ident, children = task.result()
+                resolved: list[str | Node] = [
+                    Template(id='muon-resolved-{}'.format(ident), children=children),
+                    Safe('<script>{}</script>'.format(SWAP.format(ident))),
+                ]
+
+                chunks = iter_chunks(resolved, size)
+                while (chunk := suspended.pull(chunks)) is not None:
+                    yield chunk
+    finally:
+        for task in suspended.tasks:
+            task.cancel()
+
+
+def send_file(file: SpooledTemporaryFile[bytes], chunk: SafeFile) -> int:
+    """
+    Copies a file into a spooled file (moving it to disk) with `os.sendfile`,
+    falling back to a memory mapped copy if necessary.
+    """
+    with open(chunk.path, 'rb') as source:
+        count = os.fstat(source.fileno()).st_size
+        offset = 0
+        file.flush()
+
+        try:
+            while offset < count:
+                sent = os.sendfile(file.fileno(), source.fileno(), offset, count - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            if offset:
+                raise
+        finally:
+            file.seek(0, os.SEEK_END)
+
+    if offset < count:
+        return offset + file.write(chunk.view()[offset:])
+    return offset
+
+
+def spool(node: Renderable, max_size: int = SPOOL_SIZE, size: int = CHUNK_SIZE, encoding: str = ENCODING, **limits: int | None) -> SpooledTemporaryFile[bytes]:
+    """
+    Renders a node into a binary file which is held in memory until it grows
+    past `max_size` bytes, at which point it is transparently moved to disk.
+    The returned file is positioned at the beginning of the output and may be
+    passed to `mmap` or `os.sendfile` (via `fileno`). If any limits are given
+    (see `analyze`), the tree is analyzed before rendering and outputs which
+    are expected to exceed `max_size` are written directly to disk.
+    """
+    file: SpooledTemporaryFile[bytes] = SpooledTemporaryFile(max_size)
+    max_bytes = limits.get('max_bytes')
+    written = 0
+
+    try:
+        if any(limit is not None for limit in limits.values()):
+            if analyze(node, **limits).size > max_size:
+                file.rollover()
+
+        for chunk in iter_chunks(node, size):
+            if isinstance(chunk, SafeFile) and written + os.path.getsize(chunk.path) > max_size and chunk.is_encoded(encoding):
+                written += send_file(file, chunk)
+            else:
+                written += file.write(chunk.encode(encoding))
+            if max_bytes is not None and written > max_bytes:
+                raise LimitExceeded('output exceeds {} bytes'.format(max_bytes))
+        file.seek(0)
+    except BaseException:
+        file.close()
+        raise
+
+    return file
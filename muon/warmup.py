@@ -0,0 +1,172 @@
+import hashlib
+import inspect
+import json
+import os
+from muon.build import get_inputs
+from muon.build import get_version
+from muon.build import hash_file
+from muon.elements import get_static_key
+from muon.elements import Safe
+from muon.elements import STATIC_FUNCTIONS
+from muon.elements import WARMED
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+__all__ = [
+    'Warmup',
+]
+
+
+def get_state(path: Path) -> list[int] | None:
+    """
+    Returns the modification time and size of a file (or `None` if it does not
+    exist).
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class Warmup:
+    """
+    A manifest of static functional elements (and their arguments) which are
+    rendered when a process starts. Their outputs are never evicted. If a
+    snapshot `path` is given, the outputs are saved to disk and later processes
+    load them instead of rendering. A snapshot is only loaded if the muon
+    version, the given `version`, the manifest, the source of every element,
+    every source file under the `root` directory which was imported when the
+    snapshot was saved (excluding installed packages), and any other `inputs`
+    (relative to the `root`) are unchanged. Files are only hashed again if their
+    size or modification time has changed.
+    """
+
+    def __init__(self, entries: Iterable[tuple[Callable[..., Any], dict[str, Any]]] = (), path: str | os.PathLike[str] | None = None, version: str = '', root: str | os.PathLike[str] = '.', inputs: Iterable[str | os.PathLike[str]] = ()) -> None:
+        self.entries: list[tuple[Callable[..., Any], dict[str, Any]]] = []
+        self.path = path
+        self.version = version
+        self.root = Path(root).resolve()
+        self.inputs = list(inputs)
+
+        for function, kwargs in entries:
+            self.add(function, **kwargs)
+
+    def add(self, function: Callable[..., Any], **kwargs: Any) -> None:
+        if function not in STATIC_FUNCTIONS:
+            raise ValueError('{} is not a static element'.format(getattr(function, '__qualname__', function)))
+        self.entries.append((function, kwargs))
+
+    def get_key(self) -> str:
+        """
+        Returns the key which identifies snapshots of this manifest.
+        """
+        digest = hashlib.sha256()
+        digest.update(get_version().encode())
+        digest.update(self.version.encode())
+        sources = set()
+
+        for function, kwargs in self.entries:
+            digest.update('{}.{}({!r})'.format(function.__module__, function.__qualname__, sorted(kwargs.items())).encode())
+            sources.add(inspect.getsourcefile(inspect.unwrap(function)))
+
+        for source in sorted(filter(None, sources)):
+            with open(source, 'rb') as file:
+                digest.update(hashlib.file_digest(file, 'sha256').digest())
+
+        return digest.hexdigest()
+
+    def load(self, key: str) -> bool:
+        """
+        Loads the outputs of a snapshot (if it is valid).
+        """
+        try:
+            with open(self.path, encoding='utf-8') as file:  # type: ignore
+                snapshot = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return False
+
+        if snapshot.get('key') != key or len(snapshot.get('outputs', ())) != len(self.entries):
+            return False
+
+        # Elements may depend on any module under the root
+        touched = False
+        try:
+            for path, (digest, state) in snapshot.get('inputs', {}).items():
+                current = get_state(self.root / path)
+                if current != state:
+                    if hash_file(self.root / path) != digest:
+                        return False
+                    snapshot['inputs'][path][1] = current
+                    touched = True
+        except (TypeError, ValueError):
+            return False
+
+        for (function, kwargs), (output, safe) in zip(self.entries, snapshot['outputs']):
+            self.pin(function, kwargs, Safe(output) if safe else output)
+
+        # Files which were touched without being changed are not hashed again
+        if touched:
+            self.write(snapshot)
+
+        return True
+
+    def save(self, key: str, outputs: list[str]) -> None:
+        """
+        Writes a snapshot of the outputs.
+        """
+        self.write({
+            'key': key,
+            'inputs': {path: [digest, get_state(self.root / path)] for path, digest in self.get_inputs().items()},
+            'outputs': [[output, isinstance(output, Safe)] for output in outputs],
+        })
+
+    def write(self, snapshot: dict[str, Any]) -> None:
+        """
+        Atomically writes a snapshot.
+        """
+        temporary = '{}.{}.tmp'.format(self.path, os.getpid())
+
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(snapshot, file)
+
+        os.replace(temporary, self.path)  # type: ignore
+
+    def get_inputs(self) -> dict[str, str | None]:
+        """
+        Hashes the imported source files and other inputs under the root.
+        """
+        inputs = get_inputs(self.root)
+
+        for relative in self.inputs:
+            path = (self.root / relative).resolve()
+            inputs[str(path.relative_to(self.root))] = hash_file(path)
+
+        return inputs
+
+    def pin(self, function: Callable[..., Any], kwargs: dict[str, Any], output: str) -> None:
+        static_key = get_static_key(function, kwargs)
+        if static_key is not None:
+            WARMED[static_key] = output
+
+    def run(self) -> bool:
+        """
+        Renders every element in the manifest, or loads their outputs from a
+        valid snapshot. Returns `True` if a snapshot was loaded.
+        """
+        key = self.get_key() if self.path is not None else ''
+
+        if self.path is not None and self.load(key):
+            return True
+
+        outputs = [function(**kwargs) for function, kwargs in self.entries]
+
+        for (function, kwargs), output in zip(self.entries, outputs):
+            self.pin(function, kwargs, output)
+
+        if self.path is not None:
+            self.save(key, outputs)
+
+        return False
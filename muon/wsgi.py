@@ -0,0 +1,62 @@
+from itertools import chain
+from muon.core import Renderable
+from muon.responses import accepts_gzip
+from muon.responses import BodyEncoder
+from muon.responses import CONTENT_TYPE
+from muon.responses import get_length
+from muon.responses import get_headers
+from muon.streaming import CHUNK_SIZE
+from muon.streaming import ENCODING
+from muon.streaming import iter_chunks
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+__all__ = [
+    'response',
+]
+
+Application = Callable[[dict[str, Any], Callable[..., Any]], Iterable[bytes]]
+
+
+def response(
+    node: Renderable,
+    status: str = '200 OK',
+    headers: Iterable[tuple[str, str]] = (),
+    size: int = CHUNK_SIZE,
+    compress: bool = True,
+    content_type: str = CONTENT_TYPE,
+) -> Application:
+    """
+    Creates a WSGI application which streams a node in chunks of roughly
+    `size` characters. Outputs which fit in a single chunk are sent with a
+    `Content-Length`, and gzip is used if `compress` is set and the client
+    accepts it.
+    """
+    def application(environ: dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        gzip = compress and accepts_gzip(environ.get('HTTP_ACCEPT_ENCODING'))
+        encoder = BodyEncoder(ENCODING, gzip)
+        chunks = iter_chunks(node, size)
+        head = []
+        length = 0
+
+        for chunk in chunks:
+            head.append(chunk)
+            length += get_length(chunk)
+            if length >= size:
+                break
+        else:
+            body = encoder.encode_all(head)
+            start_response(status, get_headers(headers, content_type, compress, gzip, len(body)))
+            return [body]
+
+        def iter_body() -> Iterator[bytes]:
+            for chunk in chain(head, chunks):
+                yield encoder.encode(chunk)
+            yield encoder.finish()
+
+        start_response(status, get_headers(headers, content_type, compress, gzip, None))
+        return iter_body()
+
+    return application
@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from muon.cache import SharedCache
+from typing import Any
+from typing import Callable
+
+# Shared caches synchronize processes with file locks, and forked processes
+# inherit caches which were opened by their parent
+CONTEXT = multiprocessing.get_context('fork') if sys.platform != 'win32' else None
+
+
+def run(target: Callable[..., None], *args: Any) -> int | None:
+    """
+    Runs a function in a child process, returning its exit code.
+    """
+    process = CONTEXT.Process(target=target, args=args)  # type: ignore
+    process.start()
+    process.join()
+    return process.exitcode
+
+
+def fill(path: str, size: int, slots: int, count: int) -> None:
+    cache = SharedCache(path, size=size, slots=slots)
+    for i in range(count):
+        cache.set('key-{}'.format(i), 'value-{}'.format(i) * 8)
+
+
+def set_value(cache: SharedCache, key: str, value: str) -> None:
+    cache.set(key, value)
+
+
+def open_version(path: str, version: str) -> None:
+    SharedCache(path, size=1 << 16, slots=64, version=version).set('b', 'b')
+
+
+def open_geometry(path: str, size: int) -> None:
+    try:
+        SharedCache(path, size=size)
+    except ValueError:
+        os._exit(2)
+
+
+@unittest.skipIf(CONTEXT is None, 'shared caches require file locking')
+class SharedCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'fragments.cache')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_shared_between_processes(self) -> None:
+        cache = SharedCache(self.path, size=1 << 16, slots=64)
+
+        self.assertEqual(run(fill, self.path, 1 << 16, 64, 4), 0)
+        self.assertEqual(cache.get('key-3'), 'value-3' * 8)
+
+        # Caches inherited by forked processes are reopened
+        self.assertEqual(run(set_value, cache, 'inherited', 'yes'), 0)
+        self.assertEqual(cache.get('inherited'), 'yes')
+
+    def test_ring_eviction(self) -> None:
+        cache = SharedCache(self.path, size=1024, slots=256)
+
+        self.assertEqual(run(fill, self.path, 1024, 256, 100), 0)
+        self.assertIsNone(cache.get('key-0'))
+        self.assertEqual(cache.get('key-99'), 'value-99' * 8)
+
+    def test_slot_eviction(self) -> None:
+        cache = SharedCache(self.path, size=1 << 16, slots=8)
+
+        # Every slot is probed, so the oldest slot is replaced
+        self.assertEqual(run(fill, self.path, 1 << 16, 8, 9), 0)
+        self.assertIsNone(cache.get('key-0'))
+        for i in range(1, 9):
+            self.assertEqual(cache.get('key-{}'.format(i)), 'value-{}'.format(i) * 8)
+
+    def test_version_invalidation(self) -> None:
+        cache = SharedCache(self.path, size=1 << 16, slots=64, version='1')
+        cache.set('a', 'a')
+
+        self.assertEqual(run(open_version, self.path, '2'), 0)
+
+        # Outdated processes neither read nor write entries
+        self.assertIsNone(cache.get('a'))
+        cache.set('c', 'c')
+
+        current = SharedCache(self.path, size=1 << 16, slots=64, version='2')
+        self.assertEqual(current.get('b'), 'b')
+        self.assertIsNone(current.get('c'))
+
+    def test_mismatched_geometry(self) -> None:
+        cache = SharedCache(self.path, size=1 << 20)
+
+        self.assertEqual(run(open_geometry, self.path, 1 << 12), 2)
+        self.assertEqual(os.path.getsize(self.path), cache.get_data_offset() + (1 << 20))
+
+        # The original mapping remains valid
+        self.assertEqual(run(set_value, cache, 'large', 'y' * 900000), 0)
+        self.assertEqual(cache.get('large'), 'y' * 900000)
+
+
+if __name__ == '__main__':
+    unittest.main()